@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Shared spreadsheet-title to citation-key matching
+
+generate_tables.py and verify_rq1_claims.py both resolve SLR-Deep titles to
+bib keys through CitationMatcher, so they apply the same rules. They match
+against different files (references/bibliography.bib and references/SLR.bib),
+so their results can still differ where the two bibliographies do. For each
+title the best entry is chosen by:
+1. exact normalized title
+2. fuzzy similarity (SequenceMatcher ratio, +0.1 when the years match) of at
+   least MATCH_THRESHOLD
+3. one normalized title containing the other
+
+Results (paper id + normalized title -> key, score, method) persist in
+build/cache/citation_matches.json per bib file. When the bib file changes,
+only its added or edited entries are compared with the cached titles, and
+matches to removed or edited entries are redone, so only new or edited
+titles and entries are ever matched again.
+"""
+
+import hashlib
+import json
+import os
+import re
+from difflib import SequenceMatcher
+
+import clean_bibliography
+import slr_data
+from match_reference_list import normalize_title
+
+CACHE_PATH = os.path.join(slr_data.CACHE_DIR, "citation_matches.json")
+
+# Bump when the matching rules change so cached matches are discarded
+MATCH_VERSION = "1"
+MATCH_THRESHOLD = 0.7
+YEAR_BONUS = 0.1
+# Containment needs enough text to be meaningful
+MIN_CONTAINED_LENGTH = 20
+
+# Method ranks: a better method wins regardless of score
+METHOD_RANKS = {"exact": 3, "fuzzy": 2, "substring": 1, "none": 0}
+
+
+def normalize_year(year):
+    match = re.search(r"\b(19|20)\d{2}\b", str(year))
+    return match.group(0) if match else ""
+
+
+def paper_id(value):
+    """Stable text form of a # value (3, 3.0 and '3' are the same paper)"""
+    try:
+        return str(int(float(value)))
+    except (TypeError, ValueError):
+        return ""
+
+
+def load_bib_entries(bib_path):
+    """{key: {'title', 'year'}} of a bib file (first occurrence of a key wins)"""
+    entries = {}
+    for entry in clean_bibliography.parse_bibtex(bib_path):
+        if entry.key in entries:
+            continue
+        fields = dict(clean_bibliography.parse_fields(entry.content))
+        title = fields.get("title", "").strip('{}" ')
+        if title:
+            entries[entry.key] = {"title": title, "year": normalize_year(fields.get("year", ""))}
+    return entries
+
+
+def _fingerprint(entry):
+    return hashlib.sha1(f"{normalize_title(entry['title'])}|{entry['year']}".encode("utf-8")).hexdigest()
+
+
+def score_entry(title, year, entry):
+    """(method, score) of one bib entry for a title"""
+    normalized, bib_normalized = normalize_title(title), normalize_title(entry["title"])
+    bonus = YEAR_BONUS if year and year == entry["year"] else 0.0
+    if normalized == bib_normalized:
+        return "exact", 1.0 + bonus
+    score = SequenceMatcher(None, title.lower(), entry["title"].lower()).ratio() + bonus
+    if score >= MATCH_THRESHOLD:
+        return "fuzzy", score
+    shorter = min(normalized, bib_normalized, key=len)
+    if len(shorter) >= MIN_CONTAINED_LENGTH and (normalized in bib_normalized or bib_normalized in normalized):
+        return "substring", score
+    return "none", score
+
+
+def _better(candidate, current):
+    return (METHOD_RANKS[candidate["method"]], candidate["score"]) > \
+        (METHOD_RANKS[current["method"]], current["score"])
+
+
+class CitationMatcher:
+    """Title -> citation key matches for one bib file, cached across runs."""
+
+    def __init__(self, bib_path, cache_path=CACHE_PATH):
+        self.bib_path = os.path.normpath(bib_path)
+        self.cache_path = cache_path
+        self.bib_hash = slr_data.file_sha256(bib_path) if os.path.exists(bib_path) else ""
+        self.dirty = False
+        self._entries = None
+
+        cached = self._load_cache()
+        if cached.get("bib_sha256") == self.bib_hash:
+            # Unchanged bib: the entries are only parsed if a new title comes up
+            self.fingerprints = cached["entries"]
+            self.matches = cached["matches"]
+            return
+
+        self.fingerprints = {key: _fingerprint(entry) for key, entry in self.entries.items()}
+        old_fingerprints = cached.get("entries", {})
+        changed = {key for key, fingerprint in self.fingerprints.items()
+                   if old_fingerprints.get(key) != fingerprint}
+        self.matches = {}
+        for match_id, match in cached.get("matches", {}).items():
+            if match["key"] is not None and match["key"] not in self.entries or match["key"] in changed:
+                continue  # matched entry removed or edited: match again from scratch
+            if changed:
+                match = self._best(match["title"], match["year"], changed, match)
+            self.matches[match_id] = match
+        self.dirty = True
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._entries = load_bib_entries(self.bib_path) if self.bib_hash else {}
+        return self._entries
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if cache.get("version") != MATCH_VERSION:
+            return {}
+        return cache.get("bibs", {}).get(self.bib_path, {})
+
+    def _best(self, title, year, keys, best=None):
+        best = best or {"title": title, "year": year, "key": None, "score": 0.0, "method": "none"}
+        for key in keys:
+            method, score = score_entry(title, year, self.entries[key])
+            candidate = {"title": title, "year": year, "key": key, "score": round(score, 6), "method": method}
+            if _better(candidate, best):
+                best = candidate
+        return best
+
+    def match(self, title, year="", number=""):
+        """
+        Best entry for a title: {'key', 'score', 'method'}. 'key' is None
+        when no entry matches (method 'none').
+        """
+        title, year = str(title).strip(), normalize_year(year)
+        match_id = f"{paper_id(number)}|{normalize_title(title)}"
+        cached = self.matches.get(match_id)
+        if cached is None or cached["year"] != year:
+            cached = self._best(title, year, self.entries)
+            self.matches[match_id] = cached
+            self.dirty = True
+        if cached["method"] == "none":
+            return {"key": None, "score": cached["score"], "method": "none", "best_key": cached["key"]}
+        return {"key": cached["key"], "score": cached["score"], "method": cached["method"]}
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            cache = {}
+        if cache.get("version") != MATCH_VERSION:
+            cache = {"version": MATCH_VERSION, "bibs": {}}
+        cache["bibs"][self.bib_path] = {
+            "bib_sha256": self.bib_hash,
+            "entries": self.fingerprints,
+            "matches": self.matches,
+        }
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1, ensure_ascii=False)
+        self.dirty = False
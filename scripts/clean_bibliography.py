@@ -5,25 +5,97 @@ BibTeX Duplicate Cleaner Script
 This script processes a BibTeX bibliography file to:
 1. Remove identical entries (same key and same content)
 2. Report entries with the same key but different data
-3. Write the cleaned file back
+3. Write the cleaned file back, atomically and only if it changed
+   (optionally in canonical key and field order)
 4. Print a summary report to console
+
+Conflicting entries are compared field by field. Conflicts that only differ
+in formatting or in fields missing from some occurrences are merged
+automatically; the rest are written to a JSON conflict report for review.
 """
 
+import argparse
+import hashlib
+import json
+import mmap
+import os
 import re
+import shutil
 import sys
+import tempfile
 from collections import defaultdict
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Tuple, Set, Optional
+
+
+_WHITESPACE = frozenset(b' \t\r\n\f\v')
+_TYPE_CHARS = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_')
+_BRACE_OR_COMMA = re.compile(rb'[{},]')
+_FIELD_NAME = re.compile(r'\s*,?\s*([A-Za-z][\w\-:.]*)\s*=\s*')
+
+# Field values that mean "no data" in exported bibliographies
+_EMPTY_VALUES = {'', 'null', 'none', 'n/a'}
+
+# Conflict reports are written per bib file, as <stem>_conflicts.json
+CONFLICT_REPORT_DIR = "build"
+
+# Fields whose capitalization and {} protection show up in the typeset output
+_CASE_SENSITIVE_FIELDS = {'title', 'booktitle', 'journal'}
 
 
 class BibEntry:
-    """Represents a BibTeX entry with its key, type, and content."""
-    
-    def __init__(self, key: str, entry_type: str, content: str, original_lines: Tuple[int, int]):
+    """
+    Represents a BibTeX entry with its key, type, and location in the source.
+
+    The entry text is not copied: it is stored as a (start, end) byte range
+    into the memory-mapped source file and decoded on demand. The normalized
+    content hash and the per-field hashes are computed on first use and cached.
+    """
+
+    __slots__ = ('key', 'entry_type', 'start', 'end', 'original_lines', '_source', '_hash',
+                 '_field_hashes')
+
+    def __init__(self, key: str, entry_type: str, source, start: int, end: int,
+                 original_lines: Tuple[int, int]):
         self.key = key
         self.entry_type = entry_type
-        self.content = content
+        self.start = start
+        self.end = end
         self.original_lines = original_lines  # (start_line, end_line) for reference
-    
+        self._source = source  # mmap of the .bib file, or bytes for merged entries
+        self._hash = None
+        self._field_hashes = None
+
+    @property
+    def content(self) -> str:
+        """Raw entry text, decoded from the source mapping."""
+        return self._source[self.start:self.end].decode('utf-8')
+
+    @property
+    def normalized_hash(self) -> str:
+        """Hash of the normalized entry content (see normalize_content)."""
+        if self._hash is None:
+            normalized = normalize_content(self.content)
+            self._hash = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+        return self._hash
+
+    @property
+    def field_hashes(self) -> Dict[str, str]:
+        """Map of lowercased field name to hash of its normalized value, empty fields omitted."""
+        if self._field_hashes is None:
+            hashes = {}
+            for name, raw_value in parse_fields(self.content):
+                value = normalize_field_value(name, raw_value)
+                if value not in _EMPTY_VALUES:
+                    hashes[name] = hashlib.sha1(value.encode('utf-8')).hexdigest()
+            self._field_hashes = hashes
+        return self._field_hashes
+
+    def detach(self):
+        """Copy the entry text out of the source mapping, so the mapping can be closed."""
+        if isinstance(self._source, mmap.mmap):
+            data = self._source[self.start:self.end]
+            self._source, self.start, self.end = data, 0, len(data)
+
     def __repr__(self):
         return f"BibEntry(key='{self.key}', type='{self.entry_type}', lines={self.original_lines})"
 
@@ -32,115 +104,105 @@ def parse_bibtex(file_path: str) -> List[BibEntry]:
     """
     Parse BibTeX entries from a .bib file.
     Uses brace matching to handle nested braces correctly.
+
+    The file is memory-mapped and scanned as bytes; the delimiters we look
+    for are all ASCII, so byte offsets are safe in UTF-8 input. The entries
+    keep the mapping open; call release_entries before rewriting the file
+    (Windows cannot replace a file that is still mapped).
     
     Returns a list of BibEntry objects.
     """
     entries = []
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return entries
+        # The mapping stays valid after the file object is closed
+        source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
     
+    content_len = len(source)
+    line = 1
+    line_pos = 0
     i = 0
-    content_len = len(content)
     
     while i < content_len:
         # Find next @ symbol
-        if content[i] != '@':
-            i += 1
-            continue
+        i = source.find(b'@', i)
+        if i == -1:
+            break
         
         # Mark start of entry
         entry_start = i
-        start_line = content[:entry_start].count('\n') + 1
+        line += source[line_pos:entry_start].count(b'\n')
+        line_pos = entry_start
+        start_line = line
         
         # Skip @
         i += 1
         
         # Extract entry type (skip whitespace first)
-        while i < content_len and content[i].isspace():
+        while i < content_len and source[i] in _WHITESPACE:
             i += 1
         
         entry_type_start = i
-        while i < content_len and (content[i].isalnum() or content[i] == '_'):
+        while i < content_len and source[i] in _TYPE_CHARS:
             i += 1
-        entry_type = content[entry_type_start:i]
+        entry_type = source[entry_type_start:i].decode('ascii')
         
         if not entry_type:
             i += 1
             continue
         
         # Skip whitespace before opening brace
-        while i < content_len and content[i].isspace():
+        while i < content_len and source[i] in _WHITESPACE:
             i += 1
         
-        if i >= content_len or content[i] != '{':
+        if i >= content_len or source[i] != ord('{'):
             i += 1
             continue
         
-        # Find matching closing brace for the entire entry
-        brace_start = i
+        # Walk braces (and top-level commas) to find the key and entry end
         brace_count = 1
-        i += 1  # Skip opening brace
-        
-        # Extract key (everything until first comma at brace level 1)
-        key_start = i
+        key_start = i + 1
         key_end = -1
+        entry_end = -1
         
-        while i < content_len and brace_count > 0:
-            if content[i] == '{':
+        for match in _BRACE_OR_COMMA.finditer(source, key_start):
+            char = match.group()
+            pos = match.start()
+            if char == b'{':
                 brace_count += 1
-            elif content[i] == '}':
+            elif char == b'}':
                 brace_count -= 1
                 if brace_count == 0:
-                    # Entry ends, key is everything before this
-                    key_end = i
+                    if key_end == -1:
+                        # Entry ends before any comma, key is everything before this
+                        key_end = pos
+                    entry_end = pos + 1  # Include closing brace
                     break
-            elif brace_count == 1 and content[i] == ',':
+            elif brace_count == 1 and key_end == -1:
                 # Found comma at top level - this ends the key
-                key_end = i
-                break
-            i += 1
+                key_end = pos
         
-        if key_end == -1:
+        if key_end == -1 or entry_end == -1:
             # Malformed entry
             i += 1
             continue
         
         # Extract key
-        key = content[key_start:key_end].strip()
+        key = source[key_start:key_end].decode('utf-8').strip()
         
         if not key:
             # No key found, skip
             i += 1
             continue
         
-        # Find the end of the entry (matching closing brace)
-        # Reset to brace start
-        i = brace_start
-        brace_count = 1
-        i += 1  # Skip opening brace
-        
-        entry_end = -1
-        while i < content_len:
-            if content[i] == '{':
-                brace_count += 1
-            elif content[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    entry_end = i + 1  # Include closing brace
-                    break
-            i += 1
-        
-        if entry_end == -1:
-            # Malformed entry
-            i += 1
-            continue
-        
         # Successfully found complete entry
-        end_line = content[:entry_end].count('\n') + 1
-        full_entry = content[entry_start:entry_end]
+        line += source[line_pos:entry_end].count(b'\n')
+        line_pos = entry_end
+        end_line = line
         
-        entries.append(BibEntry(key, entry_type, full_entry, (start_line, end_line)))
+        entries.append(BibEntry(key, entry_type, source, entry_start, entry_end, (start_line, end_line)))
         
         # Move to after this entry
         i = entry_end
@@ -148,6 +210,87 @@ def parse_bibtex(file_path: str) -> List[BibEntry]:
     return entries
 
 
+def release_entries(entries: List[BibEntry]):
+    """
+    Copy the entries out of their source mappings and close the mappings.
+    
+    Every entry of a parse that is still used afterwards must be passed in;
+    the others can no longer read their content.
+    """
+    sources = {}
+    for entry in entries:
+        if isinstance(entry._source, mmap.mmap):
+            sources[id(entry._source)] = entry._source
+            entry.detach()
+    for source in sources.values():
+        source.close()
+
+
+def parse_fields(content: str) -> List[Tuple[str, str]]:
+    """
+    Split the body of a BibTeX entry into (field name, raw value) pairs.
+    
+    Field names are lowercased. Raw values keep their delimiters (braces,
+    quotes, or bare tokens and # concatenations) so they can be written back.
+    """
+    fields = []
+    
+    # Body starts after the top-level comma that ends the key
+    body_start = content.find(',')
+    body_end = content.rfind('}')
+    if body_start == -1 or body_end <= body_start:
+        return fields
+    
+    i = body_start
+    while i < body_end:
+        name_match = _FIELD_NAME.match(content, i, body_end)
+        if not name_match:
+            break
+        name = name_match.group(1).lower()
+        
+        # Value runs until the next comma outside braces and quotes
+        i = value_start = name_match.end()
+        depth = 0
+        in_quotes = False
+        while i < body_end:
+            char = content[i]
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+            elif char == '"' and depth == 0:
+                in_quotes = not in_quotes
+            elif char == ',' and depth == 0 and not in_quotes:
+                break
+            i += 1
+        
+        fields.append((name, content[value_start:i].strip()))
+    
+    return fields
+
+
+def normalize_field_value(name: str, raw_value: str) -> str:
+    """
+    Normalize a single field value for comparison.
+    - Drop braces and quote delimiters
+    - Collapse whitespace and ignore case
+    - Treat page-range dash variants (-, --, en dash) as equal
+    
+    Title, booktitle and journal only drop the outer delimiters and keep
+    case and inner braces, so a different capitalization is a conflict.
+    """
+    if name in _CASE_SENSITIVE_FIELDS:
+        value = raw_value.strip()
+        if len(value) >= 2 and (value[0], value[-1]) in (('{', '}'), ('"', '"')):
+            value = value[1:-1]
+        return re.sub(r'\s+', ' ', value).strip()
+    value = re.sub(r'[{}"]', '', raw_value)
+    value = re.sub(r'\s+', ' ', value).strip().lower()
+    if name == 'pages':
+        value = re.sub(r'\s*[-\u2013\u2014]+\s*', '-', value)
+    return value
+
+
 def normalize_content(content: str) -> str:
     """
     Normalize BibTeX entry content for comparison.
@@ -166,16 +309,15 @@ def find_duplicates(entries: List[BibEntry]) -> Dict[str, List[int]]:
     """
     Find identical entries (same normalized content).
     
-    Returns a dictionary mapping normalized content to list of entry indices.
+    Returns a dictionary mapping normalized content hash to list of entry indices.
     """
     content_map = defaultdict(list)
     
     for idx, entry in enumerate(entries):
-        normalized = normalize_content(entry.content)
-        content_map[normalized].append(idx)
+        content_map[entry.normalized_hash].append(idx)
     
     # Return only entries that appear more than once
-    duplicates = {content: indices for content, indices in content_map.items() if len(indices) > 1}
+    duplicates = {digest: indices for digest, indices in content_map.items() if len(indices) > 1}
     return duplicates
 
 
@@ -197,13 +339,188 @@ def find_conflicts(entries: List[BibEntry]) -> Dict[str, List[int]]:
     actual_conflicts = {}
     for key, indices in conflicts.items():
         # Check if all entries with this key have the same content
-        contents = [normalize_content(entries[i].content) for i in indices]
-        if len(set(contents)) > 1:  # Different content
+        hashes = {entries[i].normalized_hash for i in indices}
+        if len(hashes) > 1:  # Different content
             actual_conflicts[key] = indices
     
     return actual_conflicts
 
 
+def classify_conflict(occurrences: List[BibEntry]) -> Dict:
+    """
+    Compare entries sharing a key field by field, using their cached field hashes.
+    
+    Returns a dict with:
+    - missing: field name -> occurrence numbers (1-based) that lack it
+    - differing: field names whose values disagree between occurrences
+    - type_mismatch: whether the entry types differ
+    - classification: 'formatting', 'missing_fields' or 'field_mismatch'
+    - summary: short human readable description, e.g. "same except missing doi"
+    - safe: whether the occurrences can be merged without losing information
+    """
+    field_hashes = [entry.field_hashes for entry in occurrences]
+    all_fields = []
+    for hashes in field_hashes:
+        for name in hashes:
+            if name not in all_fields:
+                all_fields.append(name)
+    
+    missing = {}
+    differing = []
+    for name in all_fields:
+        present = [hashes[name] for hashes in field_hashes if name in hashes]
+        if len(present) < len(occurrences):
+            missing[name] = [n for n, hashes in enumerate(field_hashes, 1) if name not in hashes]
+        if len(set(present)) > 1:
+            differing.append(name)
+    
+    type_mismatch = len({entry.entry_type.lower() for entry in occurrences}) > 1
+    
+    if differing or type_mismatch:
+        classification = 'field_mismatch'
+    elif missing:
+        classification = 'missing_fields'
+    else:
+        classification = 'formatting'
+    
+    parts = []
+    if type_mismatch:
+        parts.append("entry type")
+    if differing:
+        parts.append(", ".join(differing))
+    if missing:
+        parts.append("missing " + ", ".join(missing))
+    summary = "same except " + "; ".join(parts) if parts else "same except formatting"
+    
+    return {
+        'missing': missing,
+        'differing': differing,
+        'type_mismatch': type_mismatch,
+        'classification': classification,
+        'summary': summary,
+        'safe': classification != 'field_mismatch',
+    }
+
+
+def merge_entries(occurrences: List[BibEntry]) -> BibEntry:
+    """
+    Merge entries that only differ by missing fields into a single entry.
+    
+    The first occurrence is used as the base and keeps its values as written;
+    empty fields in it are filled, and absent fields appended, from the other
+    occurrences.
+    """
+    base = occurrences[0]
+    
+    merged_fields = []
+    for name, raw_value in parse_fields(base.content):
+        if name not in base.field_hashes:
+            raw_value = _find_field_value(occurrences, name) or raw_value
+        merged_fields.append((name, raw_value))
+    
+    present = {name for name, _ in merged_fields}
+    for entry in occurrences:
+        for name, raw_value in parse_fields(entry.content):
+            if name not in present and name in entry.field_hashes:
+                merged_fields.append((name, raw_value))
+                present.add(name)
+    
+    data = format_entry(base.entry_type, base.key, merged_fields).encode('utf-8')
+    
+    return BibEntry(base.key, base.entry_type, data, 0, len(data), base.original_lines)
+
+
+def format_entry(entry_type: str, key: str, fields: List[Tuple[str, str]]) -> str:
+    """Render an entry from (name, raw value) pairs with aligned field names."""
+    width = max(len(name) for name, _ in fields)
+    lines = [f"  {name.ljust(width)} = {raw_value}" for name, raw_value in fields]
+    return f"@{entry_type}{{{key},\n" + ",\n".join(lines) + "\n}"
+
+
+def _find_field_value(occurrences: List[BibEntry], name: str) -> Optional[str]:
+    """Return the first non-empty raw value for a field across occurrences."""
+    for entry in occurrences:
+        if name in entry.field_hashes:
+            for field_name, raw_value in parse_fields(entry.content):
+                if field_name == name:
+                    return raw_value
+    return None
+
+
+def resolve_conflicts(entries: List[BibEntry], conflicts: Dict[str, List[int]]) -> Tuple[List[BibEntry], List[Dict]]:
+    """
+    Classify every conflict and merge the safe ones in place.
+    
+    The merged entry takes the position of the first occurrence; the other
+    occurrences are dropped. Unsafe conflicts are left untouched.
+    
+    Returns the new entry list and one report record per conflicting key.
+    """
+    replacements = {}
+    indices_to_remove = set()
+    records = []
+    
+    for key, indices in conflicts.items():
+        occurrences = [entries[idx] for idx in indices]
+        result = classify_conflict(occurrences)
+        
+        if result['safe']:
+            if result['classification'] == 'formatting':
+                replacements[indices[0]] = occurrences[0]
+            else:
+                replacements[indices[0]] = merge_entries(occurrences)
+            indices_to_remove.update(indices[1:])
+            action = 'merged'
+        else:
+            action = 'manual'
+        
+        records.append({
+            'key': key,
+            'action': action,
+            'classification': result['classification'],
+            'summary': result['summary'],
+            'occurrences': [
+                {
+                    'type': entry.entry_type,
+                    'lines': list(entry.original_lines),
+                }
+                for entry in occurrences
+            ],
+            'missing': result['missing'],
+            'differing': {
+                name: [_find_field_value([entry], name) for entry in occurrences]
+                for name in result['differing']
+            },
+        })
+    
+    resolved = [replacements.get(idx, entry) for idx, entry in enumerate(entries)
+                if idx not in indices_to_remove]
+    
+    return resolved, records
+
+
+def conflict_report_path(bib_file: str) -> str:
+    """Path of the conflict report for a bib file, e.g. build/SLR_conflicts.json."""
+    stem = os.path.splitext(os.path.basename(bib_file))[0]
+    return os.path.join(CONFLICT_REPORT_DIR, f"{stem}_conflicts.json")
+
+
+def write_conflict_report(records: List[Dict], file_path: str):
+    """Write conflict records as JSON for review."""
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    report = {
+        'merged': sum(1 for record in records if record['action'] == 'merged'),
+        'manual': sum(1 for record in records if record['action'] == 'manual'),
+        'conflicts': records,
+    }
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
 def remove_duplicates(entries: List[BibEntry], duplicates: Dict[str, List[int]]) -> List[BibEntry]:
     """
     Remove duplicate entries, keeping only the first occurrence.
@@ -224,21 +541,102 @@ def remove_duplicates(entries: List[BibEntry], duplicates: Dict[str, List[int]])
     return unique_entries
 
 
-def write_cleaned_bib(entries: List[BibEntry], file_path: str):
+# Field order of canonical output; other fields follow alphabetically
+CANONICAL_FIELD_ORDER = [
+    'author', 'title', 'journal', 'booktitle', 'year', 'volume', 'number', 'pages',
+    'publisher', 'doi', 'url',
+]
+
+
+def canonical_fields(fields: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Sort (name, raw value) pairs by CANONICAL_FIELD_ORDER, then by name."""
+    rank = {name: position for position, name in enumerate(CANONICAL_FIELD_ORDER)}
+    return sorted(fields, key=lambda field: (rank.get(field[0], len(rank)), field[0]))
+
+
+def _file_digest(file_path: str) -> Optional[str]:
+    """SHA-256 of a file, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def atomic_write(file_path: str, chunks) -> bool:
     """
-    Write cleaned entries back to the .bib file.
-    Preserves original formatting as much as possible.
+    Stream text chunks to a temporary file next to file_path and move it into
+    place only if the content differs from the current file.
+    
+    An unchanged file keeps its mtime, so build tools do not rerun bibtex or
+    LaTeX. Readers never see a partially written file. The caller must not
+    hold a memory map of file_path (see release_entries): Windows cannot
+    replace a mapped file.
+    
+    Returns True if the file was replaced.
     """
-    with open(file_path, 'w', encoding='utf-8') as f:
-        for i, entry in enumerate(entries):
-            f.write(entry.content)
-            # Add blank line between entries (except after last)
-            if i < len(entries) - 1:
-                f.write('\n\n')
+    directory = os.path.dirname(os.path.abspath(file_path))
+    current = _file_digest(file_path)
+    digest = hashlib.sha256()
+    
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(file_path), suffix='.tmp')
+    replaced = False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+                digest.update(data)
+                f.write(data)
+        if digest.hexdigest() != current:
+            if current is not None:
+                # mkstemp creates the file 0600; keep the original permissions
+                shutil.copymode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+            replaced = True
+    finally:
+        # Unchanged content, or any error on the way: the temporary file goes
+        if not replaced and os.path.exists(temp_path):
+            os.remove(temp_path)
+    return replaced
+
+
+def write_cleaned_bib(entries: List[BibEntry], file_path: str, sort_keys: bool = False,
+                      sort_fields: bool = False) -> bool:
+    """
+    Write cleaned entries back to the .bib file, atomically and only if the
+    output differs from the current file (see atomic_write).
+    
+    By default entries keep their original order and formatting. sort_keys
+    orders entries by key; sort_fields re-renders every entry with its fields
+    in canonical order, so equivalent bibliographies produce identical files.
+    
+    The entries are copied out of their source mapping first, which is
+    closed (see release_entries).
+    
+    Returns True if the file was rewritten.
+    """
+    release_entries(entries)
+    if sort_keys:
+        entries = sorted(entries, key=lambda entry: (entry.key.casefold(), entry.key))
+    
+    def chunks():
+        for number, entry in enumerate(entries):
+            if number:
+                yield '\n\n'
+            if sort_fields:
+                yield format_entry(entry.entry_type, entry.key, canonical_fields(parse_fields(entry.content)))
+            else:
+                yield entry.content
+    
+    return atomic_write(file_path, chunks())
 
 
 def generate_report(entries: List[BibEntry], duplicates: Dict[str, List[int]], 
-                   conflicts: Dict[str, List[int]], removed_count: int):
+                   conflict_records: List[Dict], removed_count: int, merged_count: int = 0,
+                   report_path: Optional[str] = None):
     """
     Generate and print a console report with statistics and details.
     """
@@ -247,8 +645,9 @@ def generate_report(entries: List[BibEntry], duplicates: Dict[str, List[int]],
     print("=" * 70)
     print()
     
-    print(f"Total entries processed: {len(entries) + removed_count}")
+    print(f"Total entries processed: {len(entries) + removed_count + merged_count}")
     print(f"Duplicate entries removed: {removed_count}")
+    print(f"Conflicting entries merged: {merged_count}")
     print(f"Unique entries remaining: {len(entries)}")
     print()
     
@@ -269,16 +668,20 @@ def generate_report(entries: List[BibEntry], duplicates: Dict[str, List[int]],
                 print(f"  {len(indices)} identical entries (all but first removed)")
         print()
     
-    if conflicts:
-        print(f"Conflicting keys found: {len(conflicts)}")
-        print("\nEntries with same key but different data (KEPT - requires manual review):")
+    if conflict_records:
+        print(f"Conflicting keys found: {len(conflict_records)}")
+        print("\nEntries with same key but different data:")
         print("-" * 70)
-        for key, indices in conflicts.items():
-            print(f"  Key: {key} ({len(indices)} occurrences with different content)")
-            for idx in indices:
-                entry = entries[idx]
-                print(f"    - Occurrence {idx + 1}: {entry.entry_type}, lines {entry.original_lines[0]}-{entry.original_lines[1]}")
+        for record in conflict_records:
+            status = "MERGED" if record['action'] == 'merged' else "KEPT - requires manual review"
+            print(f"  Key: {record['key']} ({len(record['occurrences'])} occurrences, {status})")
+            print(f"    {record['summary']}")
+            for number, occurrence in enumerate(record['occurrences'], 1):
+                print(f"    - Occurrence {number}: {occurrence['type']}, lines {occurrence['lines'][0]}-{occurrence['lines'][1]}")
             print()
+        if report_path:
+            print(f"Conflict details written to {report_path}")
+        print()
     else:
         print("No conflicting keys found (all entries with same key have identical content).")
         print()
@@ -290,7 +693,13 @@ def generate_report(entries: List[BibEntry], duplicates: Dict[str, List[int]],
 
 def main():
     """Main function that orchestrates the entire process."""
-    bib_file = "references/bibliography.bib"
+    parser = argparse.ArgumentParser(description="Remove duplicate BibTeX entries and merge safe conflicts")
+    parser.add_argument("bib_file", nargs="?", default="references/bibliography.bib")
+    parser.add_argument("--sort-keys", action="store_true", help="order entries by citation key")
+    parser.add_argument("--sort-fields", action="store_true",
+                        help="rewrite every entry with its fields in canonical order")
+    args = parser.parse_args()
+    bib_file = args.bib_file
     
     print(f"Reading BibTeX file: {bib_file}")
     print()
@@ -305,26 +714,38 @@ def main():
     print(f"Found {len(entries)} entries.")
     print()
     
-    # Find duplicates and conflicts
+    # Find and remove duplicates (keep first occurrence)
     duplicates = find_duplicates(entries)
-    conflicts = find_conflicts(entries)
-    
-    # Remove duplicates (keep first occurrence)
     unique_entries = remove_duplicates(entries, duplicates)
     removed_count = len(entries) - len(unique_entries)
     
-    # Write cleaned file
-    if removed_count > 0:
-        print(f"Writing cleaned file (removed {removed_count} duplicate entries)...")
-        write_cleaned_bib(unique_entries, bib_file)
-        print("File updated successfully.")
+    # Classify conflicts among the remaining entries, merging the safe ones
+    conflicts = find_conflicts(unique_entries)
+    resolved_entries, conflict_records = resolve_conflicts(unique_entries, conflicts)
+    merged_count = len(unique_entries) - len(resolved_entries)
+    
+    # Copy the entries out of the mapping; it must not be open while the file is replaced
+    release_entries(entries)
+    
+    # Write cleaned file; an identical result leaves the file (and its mtime) alone
+    changed = removed_count > 0 or merged_count > 0 or args.sort_keys or args.sort_fields
+    if changed and write_cleaned_bib(resolved_entries, bib_file, args.sort_keys, args.sort_fields):
+        print(f"File updated (removed {removed_count} duplicate entries, "
+              f"merged {merged_count} conflicting entries).")
         print()
     else:
-        print("No duplicates found. File unchanged.")
+        print("No duplicates, mergeable conflicts or reordering needed. File unchanged.")
         print()
     
+    report_path = conflict_report_path(bib_file)
+    if conflict_records:
+        write_conflict_report(conflict_records, report_path)
+    elif os.path.exists(report_path):
+        # A report from an earlier run no longer applies
+        os.remove(report_path)
+    
     # Generate report
-    generate_report(unique_entries, duplicates, conflicts, removed_count)
+    generate_report(resolved_entries, duplicates, conflict_records, removed_count, merged_count, report_path)
 
 
 if __name__ == "__main__":
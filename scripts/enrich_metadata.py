@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+Offline metadata enrichment from a local bibliographic dump
+
+Fills missing fields (doi, journal/booktitle, year, publisher, volume,
+number, pages) of bib entries from a JSON-lines metadata snapshot such as a
+Crossref or DBLP export, without network access.
+
+The dump is never loaded into memory. A one-off pass writes a sorted index
+of fixed-width records (64-bit hash of the normalized DOI or title, byte
+offset of the JSON line) to build/cache/metadata/. Lookups memory-map that
+index, binary-search it in O(log n) and read only the matching lines from
+the memory-mapped dump. The index is rebuilt when the dump's size or mtime
+changes.
+
+Usage (from the repository root):
+    python scripts/enrich_metadata.py build DUMP.jsonl
+    python scripts/enrich_metadata.py enrich DUMP.jsonl [file.bib ...] [--write]
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+from array import array
+
+import numpy as np
+
+import clean_bibliography
+import slr_data
+from match_reference_list import normalize_title
+
+INDEX_DIR = os.path.join(slr_data.CACHE_DIR, "metadata")
+DEFAULT_BIB_PATHS = ["./references/SLR.bib"]
+
+# Bump when key normalization or the index layout changes
+INDEX_VERSION = "2"
+INDEX_DTYPE = np.dtype([("key", "<u8"), ("offset", "<u8")])
+
+# Fields filled from the dump, in the order they are appended
+ENRICHED_FIELDS = ["doi", "journal", "booktitle", "year", "publisher", "volume", "number", "pages"]
+
+# Crossref types and DBLP keys that mean a conference paper
+PROCEEDINGS_TYPES = {"proceedings-article", "inproceedings", "conference paper"}
+_DOI_PREFIX = re.compile(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+
+def strip_doi_prefix(doi):
+    """The DOI as written, without a resolver URL or doi: prefix"""
+    return _DOI_PREFIX.sub("", doi.strip())
+
+
+def normalize_doi(doi):
+    """DOIs are case-insensitive; this form is only used for lookups"""
+    return strip_doi_prefix(doi).lower()
+
+
+def hash_key(kind, value):
+    """64-bit key for a normalized DOI or title"""
+    digest = hashlib.blake2b(f"{kind}:{value}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _first(value):
+    """Crossref wraps titles and venues in lists"""
+    if isinstance(value, list):
+        return value[0] if value else ""
+    return value or ""
+
+
+def _year(record):
+    for name in ("published", "published-print", "published-online", "issued"):
+        parts = (record.get(name) or {}).get("date-parts") or [[None]]
+        if parts[0] and parts[0][0]:
+            return str(parts[0][0])
+    return str(record.get("year") or "")
+
+
+def normalize_record(record):
+    """Map a Crossref or DBLP JSON record to bib field names (empty fields omitted)"""
+    record_type = str(record.get("type", "")).lower()
+    venue = _first(record.get("container-title")) or record.get("journal") or \
+        record.get("booktitle") or record.get("venue") or ""
+    is_proceedings = record_type in PROCEEDINGS_TYPES or ("booktitle" in record and "journal" not in record)
+    fields = {
+        "title": _first(record.get("title")),
+        "doi": strip_doi_prefix(str(record.get("DOI") or record.get("doi") or "")),
+        "booktitle" if is_proceedings else "journal": _first(venue),
+        "year": _year(record),
+        "publisher": record.get("publisher") or "",
+        "volume": str(record.get("volume") or ""),
+        "number": str(record.get("issue") or record.get("number") or ""),
+        "pages": str(record.get("page") or record.get("pages") or ""),
+    }
+    return {name: str(value).strip() for name, value in fields.items() if str(value).strip()}
+
+
+def record_keys(fields):
+    keys = []
+    if fields.get("doi"):
+        keys.append(hash_key("doi", normalize_doi(fields["doi"])))
+    title = normalize_title(fields.get("title", ""))
+    if title:
+        keys.append(hash_key("title", title))
+    return keys
+
+
+# --- Index -------------------------------------------------------------------
+
+def index_paths(dump_path):
+    base = os.path.join(INDEX_DIR, os.path.basename(dump_path))
+    return base + ".idx", base + ".json"
+
+
+def _dump_signature(dump_path):
+    stat = os.stat(dump_path)
+    return {"version": INDEX_VERSION, "dump": os.path.abspath(dump_path),
+            "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def index_is_current(dump_path):
+    index_path, meta_path = index_paths(dump_path)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return False
+    return os.path.exists(index_path) and all(
+        meta.get(name) == value for name, value in _dump_signature(dump_path).items())
+
+
+def build_index(dump_path):
+    """Stream the dump once and write the sorted (key, offset) index. Returns the record count."""
+    keys, offsets = array("Q"), array("Q")
+    skipped = 0
+    with open(dump_path, "rb") as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                try:
+                    fields = normalize_record(json.loads(line))
+                except (ValueError, AttributeError):
+                    skipped += 1
+                else:
+                    for key in record_keys(fields):
+                        keys.append(key)
+                        offsets.append(offset)
+            offset += len(line)
+
+    index = np.empty(len(keys), dtype=INDEX_DTYPE)
+    index["key"] = np.frombuffer(keys, dtype="<u8") if keys else []
+    index["offset"] = np.frombuffer(offsets, dtype="<u8") if offsets else []
+    index.sort(order="key", kind="stable")
+
+    index_path, meta_path = index_paths(dump_path)
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    index.tofile(index_path)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(dict(_dump_signature(dump_path), keys=len(index), skipped=skipped), f, indent=2)
+    if skipped:
+        print(f"⚠ Skipped {skipped} unparseable lines in {dump_path}")
+    return len(index)
+
+
+class MetadataIndex:
+    """Memory-mapped lookups by DOI or normalized title into a JSON-lines dump."""
+
+    def __init__(self, dump_path):
+        index_path, _ = index_paths(dump_path)
+        self._dump_file = open(dump_path, "rb")
+        self._dump = mmap.mmap(self._dump_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index_map = None
+        if os.path.getsize(index_path):
+            with open(index_path, "rb") as f:
+                self._index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index = np.frombuffer(self._index_map, dtype=INDEX_DTYPE)
+        else:
+            self._index = np.empty(0, dtype=INDEX_DTYPE)
+
+    def close(self):
+        # The array is a view into the index mapping and must go first
+        self._index = np.empty(0, dtype=INDEX_DTYPE)
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        self._dump.close()
+        self._dump_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _records(self, key):
+        """Records stored under a hash key (binary search, then the run of equal keys)"""
+        keys = self._index["key"]
+        position = int(np.searchsorted(keys, np.uint64(key)))
+        while position < len(keys) and keys[position] == key:
+            offset = int(self._index["offset"][position])
+            end = self._dump.find(b"\n", offset)
+            line = self._dump[offset:end if end != -1 else len(self._dump)]
+            yield normalize_record(json.loads(line))
+            position += 1
+
+    def by_doi(self, doi):
+        doi = normalize_doi(doi)
+        # Hash collisions are possible, so confirm on the record itself
+        return next((fields for fields in self._records(hash_key("doi", doi))
+                     if normalize_doi(fields.get("doi", "")) == doi), None)
+
+    def by_title(self, title, year=""):
+        """Record with this normalized title, preferring one from `year`"""
+        title = normalize_title(title)
+        candidates = [fields for fields in self._records(hash_key("title", title))
+                      if normalize_title(fields.get("title", "")) == title]
+        for fields in candidates:
+            if year and fields.get("year") == year:
+                return fields
+        return candidates[0] if candidates else None
+
+
+# --- Enrichment --------------------------------------------------------------
+
+def _bare(raw_value):
+    return raw_value.strip().strip('{}" ').strip()
+
+
+def enrich_entry(entry, index):
+    """Return (fields with the gaps filled, names of the filled fields) for one entry"""
+    fields = clean_bibliography.parse_fields(entry.content)
+    present = set(entry.field_hashes)
+    values = {name: _bare(raw_value) for name, raw_value in fields}
+
+    record = None
+    if values.get("doi") and "doi" in present:
+        record = index.by_doi(values["doi"])
+    if record is None and values.get("title"):
+        record = index.by_title(values["title"], values.get("year", ""))
+    if record is None:
+        return fields, []
+
+    # An entry has one venue field; do not add booktitle to a journal article
+    has_venue = "journal" in present or "booktitle" in present
+    filled = []
+    for name in ENRICHED_FIELDS:
+        if name in present or name not in record:
+            continue
+        if name in ("journal", "booktitle") and has_venue:
+            continue
+        value = "{" + record[name] + "}"
+        if any(field_name == name for field_name, _ in fields):
+            fields = [(field_name, value if field_name == name else raw) for field_name, raw in fields]
+        else:
+            fields.append((name, value))
+        filled.append(name)
+    return fields, filled
+
+
+def enrich_bib(bib_path, index, write=False):
+    """Enrich every entry of a bib file; rewrites only the changed entries when `write`"""
+    entries = clean_bibliography.parse_bibtex(bib_path)
+    changes = []
+    for entry in entries:
+        fields, filled = enrich_entry(entry, index)
+        if filled:
+            text = clean_bibliography.format_entry(entry.entry_type, entry.key, fields)
+            changes.append((entry.key, entry.start, entry.end, text, filled))
+    # The file cannot be replaced while it is mapped (Windows)
+    clean_bibliography.release_entries(entries)
+
+    if write and changes:
+        with open(bib_path, "rb") as f:
+            data = f.read()
+        # Splice from the end so earlier byte offsets stay valid
+        for _, start, end, text, _ in sorted(changes, key=lambda change: change[1], reverse=True):
+            data = data[:start] + text.encode("utf-8") + data[end:]
+        clean_bibliography.atomic_write(bib_path, [data])
+    return [(key, filled) for key, _, _, _, filled in changes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill missing bib fields from a local metadata dump")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="index a JSON-lines dump")
+    build_parser.add_argument("dump")
+    enrich_parser = commands.add_parser("enrich", help="fill missing fields in bib files")
+    enrich_parser.add_argument("dump")
+    enrich_parser.add_argument("bibs", nargs="*", default=DEFAULT_BIB_PATHS)
+    enrich_parser.add_argument("--write", action="store_true", help="update the bib files (default: report only)")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.dump):
+        print(f"✗ Dump not found: {args.dump}")
+        sys.exit(1)
+
+    if args.command == "build" or not index_is_current(args.dump):
+        print(f"✓ Indexed {build_index(args.dump)} keys from {args.dump}")
+    if args.command == "build":
+        return
+
+    with MetadataIndex(args.dump) as index:
+        for bib_path in args.bibs:
+            enriched = enrich_bib(bib_path, index, args.write)
+            print(f"\n{bib_path}: {len(enriched)} entries enriched")
+            for key, filled in enriched:
+                print(f"  {key}: + {', '.join(filled)}")
+    if not args.write:
+        print("\n(dry run: pass --write to update the bib files)")
+
+
+if __name__ == "__main__":
+    main()
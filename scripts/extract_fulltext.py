@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Full-text extraction for the reviewed paper PDFs
+
+Extracts the text of every PDF under a directory (default:
+references/papers) across a process pool. Extracted text is cached by the
+SHA-256 of the PDF, and a manifest remembers each file's size and mtime
+(one section per PDF directory, so runs over different directories share the
+text cache without invalidating each other), so reruns only hash new or
+modified files and only extract content that has never been seen before.
+
+Requires pypdf (pip install pypdf).
+
+Usage (from the repository root):
+    python scripts/extract_fulltext.py [pdf_dir]
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import slr_data
+
+PDF_DIR = "./references/papers"
+TEXT_CACHE_DIR = os.path.join(slr_data.CACHE_DIR, "fulltext")
+MANIFEST_PATH = os.path.join(TEXT_CACHE_DIR, "manifest.json")
+
+# Bump when the manifest layout changes so old manifests are discarded
+MANIFEST_VERSION = "2"
+
+
+def extract_pdf_text(path):
+    """Extract the text of one PDF, page by page (runs in a worker process)"""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    pages = []
+    for page in reader.pages:
+        try:
+            pages.append(page.extract_text() or "")
+        except Exception:
+            # A single broken page should not lose the whole paper
+            pages.append("")
+    return "\n\f\n".join(pages)
+
+
+def text_path(digest):
+    return os.path.join(TEXT_CACHE_DIR, f"{digest}.txt")
+
+
+def load_manifests():
+    """{absolute PDF directory: manifest} for every directory extracted so far"""
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data["dirs"]
+
+
+def load_manifest(pdf_dir=PDF_DIR):
+    return load_manifests().get(os.path.abspath(pdf_dir), {})
+
+
+def save_manifests(manifests):
+    os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "dirs": manifests}, f, indent=2, sort_keys=True)
+
+
+def find_pdfs(pdf_dir):
+    """All PDFs under pdf_dir as paths relative to it"""
+    pdfs = []
+    for root, _, files in os.walk(pdf_dir):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                pdfs.append(os.path.relpath(os.path.join(root, name), pdf_dir))
+    return sorted(pdfs)
+
+
+def extract_all(pdf_dir=PDF_DIR, workers=None):
+    """
+    Bring the text cache up to date with the PDFs in pdf_dir.
+
+    Returns the manifest: relative PDF path -> {sha256, size, mtime_ns}.
+    """
+    manifests = load_manifests()
+    dir_key = os.path.abspath(pdf_dir)
+    old_manifest = manifests.get(dir_key, {})
+    manifest = {}
+    to_extract = {}  # sha256 -> absolute path of one PDF with that content
+
+    for rel_path in find_pdfs(pdf_dir):
+        path = os.path.join(pdf_dir, rel_path)
+        stat = os.stat(path)
+        previous = old_manifest.get(rel_path)
+        if previous and previous["size"] == stat.st_size and previous["mtime_ns"] == stat.st_mtime_ns:
+            digest = previous["sha256"]
+        else:
+            digest = slr_data.file_sha256(path)
+        manifest[rel_path] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if not os.path.exists(text_path(digest)):
+            to_extract.setdefault(digest, path)
+
+    print(f"✓ Found {len(manifest)} PDFs in {pdf_dir}, {len(to_extract)} need extraction")
+
+    if to_extract:
+        os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+        digests = list(to_extract)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(extract_pdf_text, to_extract[digest]) for digest in digests]
+            for digest, future in zip(digests, futures):
+                try:
+                    text = future.result()
+                except Exception as e:
+                    print(f"✗ Could not extract {to_extract[digest]}: {e}")
+                    continue
+                with open(text_path(digest), "w", encoding="utf-8") as f:
+                    f.write(text)
+
+    # Drop cached texts no PDF in any extracted directory refers to any more
+    manifests[dir_key] = manifest
+    live = {entry["sha256"] for entries in manifests.values() for entry in entries.values()}
+    for name in os.listdir(TEXT_CACHE_DIR) if os.path.isdir(TEXT_CACHE_DIR) else []:
+        if name.endswith(".txt") and name[:-4] not in live:
+            os.remove(os.path.join(TEXT_CACHE_DIR, name))
+
+    save_manifests(manifests)
+    return manifest
+
+
+def load_texts(manifest=None, pdf_dir=PDF_DIR):
+    """Return {relative PDF path: extracted text} for every extracted paper in pdf_dir"""
+    if manifest is None:
+        manifest = load_manifest(pdf_dir)
+    texts = {}
+    for rel_path, entry in manifest.items():
+        try:
+            with open(text_path(entry["sha256"]), "r", encoding="utf-8") as f:
+                texts[rel_path] = f.read()
+        except FileNotFoundError:
+            continue
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract full text from paper PDFs")
+    parser.add_argument("pdf_dir", nargs="?", default=PDF_DIR)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.pdf_dir):
+        print(f"✗ PDF directory not found: {args.pdf_dir}")
+        sys.exit(1)
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        print("✗ pypdf is required: pip install pypdf")
+        sys.exit(1)
+
+    manifest = extract_all(args.pdf_dir, args.workers)
+    print(f"✓ Text for {len(load_texts(manifest))} papers cached in {TEXT_CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
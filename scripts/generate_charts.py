@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Chart suite for the RQ sections
+
+Reads the chart definitions from charts.json, loads the SLR-Deep sheet and
+the bibliography once, computes every aggregation the specs refer to, and
+renders the charts concurrently in a process pool. All figures go through
+one export backend that writes each requested format (pdf, png, svg via
+Kaleido; html without it, sharing one plotly.min.js so the pages work
+offline) to the output directory. Sunburst and treemap charts are drawn
+natively as svg and pdf (see vector_charts.py).
+
+A chart spec names its `type` (bar, pie, box, histogram, sunburst, treemap), the
+`data` aggregation it plots (see AGGREGATIONS) and optional `title`,
+`x_title`, `y_title`, `horizontal`, `limit`, `metrics`, `log_y` and
+`formats` (overriding the suite-wide list).
+
+Usage (from the repository root):
+    python scripts/generate_charts.py [chart names ...] [--spec charts.json] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import generate_sunburst
+import slr_data
+import validate_slr_data
+import verify_rq1_claims
+
+SPEC_PATH = "./charts.json"
+EXCEL_PATH = "./SLR.xlsx"
+BIB_PATH = "./references/SLR.bib"
+
+# Every column any aggregation reads, loaded in one pass
+COLUMNS = ["#", "title", "Year", "LLM", "Category", "eval", "result", "ER"]
+
+
+# --- Aggregations (main process) ----------------------------------------------
+
+def _counts(counter):
+    return {"labels": list(counter), "values": list(counter.values())}
+
+
+def publications_per_year(context):
+    years = validate_slr_data.typed_frame(context["df"][["Year"]])["Year"].dropna()
+    return _counts(Counter(dict(sorted(Counter(str(year) for year in years).items()))))
+
+
+def model_types(context):
+    model_counts, _ = verify_rq1_claims.verify_model_usage(context["df"], context["matches"])
+    return _counts(Counter({name: len(papers) for name, papers in model_counts.items() if papers}))
+
+
+def _venues(context):
+    if "venues" not in context:
+        context["venues"], _ = verify_rq1_claims.verify_publication_venues(
+            context["df"], context["matches"], context["bib"])
+    return context["venues"]
+
+
+def venue_tiers(context):
+    return _counts(Counter({tier: len(papers) for tier, papers in _venues(context).items() if papers}))
+
+
+def venues(context):
+    names = Counter(paper["venue"] for papers in _venues(context).values() for paper in papers
+                    if paper["venue"])
+    return _counts(Counter(dict(names.most_common())))
+
+
+def _metric_text(df):
+    return (df["eval"].fillna("").astype(str) + " " + df["result"].fillna("").astype(str)).str.lower()
+
+
+def metric_usage(context):
+    text = _metric_text(context["df"])
+    usage = Counter({name: int(text.str.contains(pattern, regex=True).sum())
+                     for name, pattern in context["spec"].get("metrics", {}).items()})
+    return _counts(Counter(dict(usage.most_common())))
+
+
+def metric_values(context):
+    """First value reported per paper for each metric, e.g. 'PPL: 28.9' or 'BPW=0.53'"""
+    series = {}
+    for name in context["spec"].get("metrics", {}):
+        pattern = rf"\b{re.escape(name)}\b[^:=\n]*[:=]\s*(\d+(?:\.\d+)?)"
+        values = context["df"]["result"].fillna("").astype(str).str.extract(pattern, flags=re.IGNORECASE)[0]
+        series[name] = pd.to_numeric(values, errors="coerce").dropna().tolist()
+    return {"series": series}
+
+
+def embedding_rate(context):
+    return {"values": pd.to_numeric(context["df"]["ER"], errors="coerce").dropna().tolist()}
+
+
+def categories(context):
+    return {"records": context["df"][["#", "title", "Category"]].to_dict("records")}
+
+
+AGGREGATIONS = {
+    "publications_per_year": publications_per_year,
+    "model_types": model_types,
+    "venue_tiers": venue_tiers,
+    "venues": venues,
+    "metric_usage": metric_usage,
+    "metric_values": metric_values,
+    "embedding_rate": embedding_rate,
+    "categories": categories,
+}
+
+
+# --- Rendering (worker processes) ---------------------------------------------
+
+# Category hierarchies, drawn by vector_charts.py for these formats
+HIERARCHY_CHARTS = ("sunburst", "treemap")
+NATIVE_FORMATS = ("svg", "pdf")
+
+
+def export_figure(fig, base_path, formats):
+    """Write `fig` as base_path.<format> for every format. Returns the written paths."""
+    import plotly.io as pio
+
+    paths = []
+    for fmt in formats:
+        path = f"{base_path}.{fmt}"
+        if fmt == "html":
+            fig.write_html(path, include_plotlyjs="directory")
+        else:
+            pio.write_image(fig, path, format=fmt)
+        paths.append(path)
+    return paths
+
+
+def build_figure(chart, data):
+    import plotly.graph_objects as go
+
+    kind = chart["type"]
+    if kind in HIERARCHY_CHARTS:
+        df = generate_sunburst.prepare_sunburst_data(pd.DataFrame(data["records"]))
+        if kind == "treemap":
+            return generate_sunburst.build_treemap_figure(df)
+        return generate_sunburst.build_sunburst_figure(df)
+
+    if kind in ("bar", "pie"):
+        labels, values = data["labels"], data["values"]
+        if chart.get("limit"):
+            labels, values = labels[:chart["limit"]], values[:chart["limit"]]
+        if kind == "pie":
+            trace = go.Pie(labels=labels, values=values, sort=False,
+                           marker=dict(colors=generate_sunburst.color_palette))
+        elif chart.get("horizontal"):
+            # Largest at the top
+            trace = go.Bar(x=values[::-1], y=labels[::-1], orientation="h",
+                           marker_color=generate_sunburst.color_palette[0])
+        else:
+            trace = go.Bar(x=labels, y=values, marker_color=generate_sunburst.color_palette[0])
+        fig = go.Figure(trace)
+    elif kind == "box":
+        names = chart.get("metrics") or list(data["series"])
+        fig = go.Figure([go.Box(y=data["series"].get(name, []), name=name, boxpoints="all",
+                                marker_color=generate_sunburst.color_palette[i % len(generate_sunburst.color_palette)])
+                         for i, name in enumerate(names)])
+    elif kind == "histogram":
+        fig = go.Figure(go.Histogram(x=data["values"], marker_color=generate_sunburst.color_palette[0]))
+    else:
+        raise ValueError(f"Unknown chart type: {kind}")
+
+    fig.update_layout(
+        title=dict(text=chart.get("title", ""), font=dict(size=20, family="Helvetica", color="black")),
+        xaxis_title=chart.get("x_title"),
+        yaxis_title=chart.get("y_title"),
+        yaxis_type="log" if chart.get("log_y") else None,
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        showlegend=kind == "pie",
+        margin=dict(t=60, l=40, r=20, b=40),
+    )
+    return fig
+
+
+def render_chart(chart, data, output_dir, formats):
+    """Build one chart and export it (runs in a worker process)"""
+    base_path = os.path.join(output_dir, chart["name"])
+    formats = chart.get("formats", formats)
+    paths = []
+    if chart["type"] in HIERARCHY_CHARTS:
+        # Drawn natively, without starting Kaleido; plotly only for the other formats
+        df = generate_sunburst.prepare_sunburst_data(pd.DataFrame(data["records"]))
+        for fmt in [fmt for fmt in formats if fmt in NATIVE_FORMATS]:
+            generate_sunburst.render_chart(df, f"{base_path}.{fmt}", chart["type"])
+            paths.append(f"{base_path}.{fmt}")
+        formats = [fmt for fmt in formats if fmt not in NATIVE_FORMATS]
+        if not formats:
+            return paths
+    return paths + export_figure(build_figure(chart, data), base_path, formats)
+
+
+# --- Suite ------------------------------------------------------------------------
+
+def load_spec(path=SPEC_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_context(spec):
+    """The one data load shared by every aggregation"""
+    df = slr_data.load_sheet(EXCEL_PATH, COLUMNS)
+    bib = verify_rq1_claims.parse_bib_file(BIB_PATH)
+    matches, _ = verify_rq1_claims.match_papers_to_bib(df, bib)
+    return {"spec": spec, "df": df, "bib": bib, "matches": matches}
+
+
+def render_suite(spec, names=None, workers=None):
+    """Render the charts in `spec` (or just `names`). Returns {chart name: paths or exception}."""
+    charts = [chart for chart in spec["charts"] if not names or chart["name"] in names]
+    context = load_context(spec)
+
+    datasets = {}
+    for chart in charts:
+        if chart["data"] not in datasets:
+            datasets[chart["data"]] = AGGREGATIONS[chart["data"]](context)
+
+    output_dir = spec.get("output_dir", "output")
+    os.makedirs(output_dir, exist_ok=True)
+    formats = spec.get("formats", ["pdf"])
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {chart["name"]: pool.submit(render_chart, chart, datasets[chart["data"]], output_dir, formats)
+                   for chart in charts}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = e
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the chart suite defined in charts.json")
+    parser.add_argument("charts", nargs="*", help="only render these charts")
+    parser.add_argument("--spec", default=SPEC_PATH)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    spec = load_spec(args.spec)
+    unknown = [chart["data"] for chart in spec["charts"] if chart["data"] not in AGGREGATIONS]
+    unknown += [name for name in args.charts if name not in {chart["name"] for chart in spec["charts"]}]
+    if unknown:
+        print(f"✗ Unknown charts or aggregations: {', '.join(unknown)}")
+        sys.exit(1)
+
+    results = render_suite(spec, args.charts, args.workers)
+    failed = 0
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"✗ {name}: {str(result).strip().splitlines()[0]}")
+        else:
+            print(f"✓ {name}: {', '.join(result)}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
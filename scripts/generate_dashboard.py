@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+Offline HTML review dashboard
+
+Writes a single self-contained HTML file (no CDN, no server) for browsing
+the SLR-Deep sheet:
+- paper counts per category, per year and per model type, precomputed here
+  and shipped as compact JSON; clicking a bar filters the papers
+- the paper table, virtually scrolled so only the visible rows exist in the
+  DOM, with search and sortable columns
+- a detail pane with the long text columns, which are kept in a separate
+  JSON block and only parsed when a paper is first opened
+
+Rows are stored column-wise with categories, years and model types as
+integer codes, so the page stays small and responsive with 10k+ papers.
+
+Usage (from the repository root):
+    python scripts/generate_dashboard.py [--output output/dashboard.html]
+"""
+
+import argparse
+import html
+import json
+import os
+
+import pandas as pd
+
+import slr_data
+import validate_slr_data
+import verify_rq1_claims
+
+EXCEL_PATH = "./SLR.xlsx"
+OUTPUT_PATH = "./output/dashboard.html"
+TITLE = "SLR Review Dashboard"
+
+# Long text columns shown in the detail pane, when present in the sheet
+DETAIL_COLUMNS = [
+    "Type", "input", "LLM", "Main strengths", "Main weaknesses", "dataset", "ER", "eval",
+    "result", "code available", "pipline method used", "context aware", "categ context",
+    "representation context", "context usage in method detail text",
+]
+NOT_SPECIFIED = "N/A"
+
+
+def _text(value):
+    return str(value).strip() if pd.notna(value) and str(value).strip() else ""
+
+
+def _encode(values):
+    """(codes, labels) with labels sorted, like pandas.factorize(sort=True)"""
+    codes, labels = pd.factorize(pd.Series(values, dtype=object), sort=True)
+    return codes.tolist(), [str(label) for label in labels]
+
+
+def _counts(codes, labels):
+    counts = [0] * len(labels)
+    for code in codes:
+        counts[code] += 1
+    return counts
+
+
+def build_payload(df):
+    """(summary JSON, details JSON) for the dashboard"""
+    df = validate_slr_data.typed_frame(df)
+    numbers = [int(n) if pd.notna(n) else None for n in df["#"]]
+    titles = [_text(title) or NOT_SPECIFIED for title in df["title"]]
+    years = [str(int(year)) if pd.notna(year) else NOT_SPECIFIED for year in df["Year"]]
+    categories = [_text(category) or NOT_SPECIFIED for category in df["Category"]]
+    llms = [_text(llm) for llm in df["LLM"]] if "LLM" in df else [""] * len(df)
+
+    # Each distinct LLM description is classified once
+    model_types = {llm: verify_rq1_claims.classify_model_type(llm) for llm in set(llms)}
+
+    dimensions = {}
+    for name, values in (("category", categories), ("year", years),
+                         ("model", [model_types[llm] for llm in llms])):
+        codes, labels = _encode(values)
+        dimensions[name] = {"labels": labels, "codes": codes, "counts": _counts(codes, labels)}
+
+    summary = {
+        "total": len(df),
+        "dimensions": dimensions,
+        "rows": {"number": numbers, "title": titles, "llm": llms},
+    }
+    detail_columns = [column for column in DETAIL_COLUMNS if column in df.columns]
+    details = {
+        "columns": detail_columns,
+        "rows": [[_text(value) for value in row]
+                 for row in df[detail_columns].itertuples(index=False, name=None)],
+    }
+    return summary, details
+
+
+def _script_json(data):
+    """JSON that is safe inside a <script> element"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+def render_dashboard(summary, details, title=TITLE):
+    return (TEMPLATE.replace("__TITLE__", html.escape(title))
+            .replace("__SUMMARY__", _script_json(summary))
+            .replace("__DETAILS__", _script_json(details)))
+
+
+def write_dashboard(df, output_path=OUTPUT_PATH):
+    summary, details = build_payload(df)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(render_dashboard(summary, details))
+    print(f"✓ Dashboard with {summary['total']} papers written to {output_path}")
+
+
+TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  body { margin: 0; font: 14px Helvetica, Arial, sans-serif; color: #222; display: flex; height: 100vh; }
+  #side { width: 280px; overflow-y: auto; padding: 12px; border-right: 1px solid #ddd; }
+  #main { flex: 1; display: flex; flex-direction: column; min-width: 0; }
+  #detail { width: 380px; overflow-y: auto; padding: 12px; border-left: 1px solid #ddd; }
+  h1 { font-size: 18px; margin: 0 0 8px; }
+  h2 { font-size: 14px; margin: 16px 0 6px; }
+  .bar { display: flex; align-items: center; cursor: pointer; margin: 2px 0; }
+  .bar:hover { background: #f2f2f2; }
+  .bar.active { background: #e3eef7; font-weight: bold; }
+  .bar .label { width: 110px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
+  .bar .fill { height: 12px; background: #2E86AB; margin: 0 6px; }
+  .bar .count { color: #666; font-size: 12px; }
+  #toolbar { padding: 8px; border-bottom: 1px solid #ddd; display: flex; gap: 8px; align-items: center; }
+  #search { flex: 1; padding: 4px 6px; }
+  #header, .row { display: grid; grid-template-columns: 50px minmax(0, 3fr) 60px minmax(0, 1fr) minmax(0, 2fr); }
+  #header { font-weight: bold; border-bottom: 2px solid #ccc; }
+  #header div { cursor: pointer; padding: 4px 6px; }
+  #viewport { flex: 1; overflow-y: auto; position: relative; }
+  #spacer { position: relative; }
+  .row { position: absolute; left: 0; right: 0; height: 28px; border-bottom: 1px solid #eee; cursor: pointer; }
+  .row div { padding: 6px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
+  .row:hover { background: #f7f7f7; }
+  .row.selected { background: #e3eef7; }
+  dt { font-weight: bold; margin-top: 10px; }
+  dd { margin: 2px 0 0; white-space: pre-wrap; }
+</style>
+</head>
+<body>
+<div id="side">
+  <h1>__TITLE__</h1>
+  <div id="status"></div>
+  <div id="charts"></div>
+</div>
+<div id="main">
+  <div id="toolbar"><input id="search" placeholder="Search titles and models"><button id="clear">Clear filters</button></div>
+  <div id="header"><div data-sort="number">#</div><div data-sort="title">Title</div><div data-sort="year">Year</div><div data-sort="category">Category</div><div data-sort="llm">LLM</div></div>
+  <div id="viewport"><div id="spacer"></div></div>
+</div>
+<div id="detail"><p>Select a paper to see its details.</p></div>
+<script type="application/json" id="summary-data">__SUMMARY__</script>
+<script type="application/json" id="details-data">__DETAILS__</script>
+<script>
+(function () {
+  var ROW_HEIGHT = 28, OVERSCAN = 10;
+  var data = JSON.parse(document.getElementById("summary-data").textContent);
+  var dims = data.dimensions, rows = data.rows, total = data.total;
+  var details = null;  // parsed on first use
+  var filters = {category: null, year: null, model: null};
+  var query = "", sortKey = "number", sortDir = 1, selected = -1;
+  var visible = [], searchText = null;
+  var viewport = document.getElementById("viewport"), spacer = document.getElementById("spacer");
+
+  function value(key, i) {
+    if (key in dims) return dims[key].labels[dims[key].codes[i]];
+    return rows[key][i];
+  }
+
+  function applyFilters() {
+    if (query && !searchText) {
+      searchText = rows.title.map(function (t, i) { return (t + " " + rows.llm[i]).toLowerCase(); });
+    }
+    visible = [];
+    for (var i = 0; i < total; i++) {
+      var keep = true;
+      for (var name in filters) {
+        if (filters[name] !== null && dims[name].codes[i] !== filters[name]) { keep = false; break; }
+      }
+      if (keep && query && searchText[i].indexOf(query) < 0) keep = false;
+      if (keep) visible.push(i);
+    }
+    visible.sort(function (a, b) {
+      var x = value(sortKey, a), y = value(sortKey, b);
+      if (x === y) return a - b;
+      if (x === null) return 1;
+      if (y === null) return -1;
+      return (x < y ? -1 : 1) * sortDir;
+    });
+    spacer.style.height = visible.length * ROW_HEIGHT + "px";
+    renderCharts();
+    renderRows(true);
+  }
+
+  function filteredCounts(name) {
+    // Unfiltered counts are precomputed; otherwise count the visible rows
+    if (visible.length === total) return dims[name].counts;
+    var counts = dims[name].labels.map(function () { return 0; });
+    for (var k = 0; k < visible.length; k++) counts[dims[name].codes[visible[k]]]++;
+    return counts;
+  }
+
+  function renderCharts() {
+    var titles = {category: "Categories", year: "Years", model: "Model types"};
+    var out = [];
+    for (var name in titles) {
+      var counts = filteredCounts(name), max = Math.max.apply(null, counts.concat([1]));
+      out.push("<h2>" + titles[name] + "</h2>");
+      dims[name].labels.forEach(function (label, code) {
+        var active = filters[name] === code ? " active" : "";
+        out.push('<div class="bar' + active + '" data-dim="' + name + '" data-code="' + code + '">' +
+          '<span class="label" title="' + escapeHtml(label) + '">' + escapeHtml(label) + '</span>' +
+          '<span class="fill" style="width:' + Math.round(100 * counts[code] / max) + 'px"></span>' +
+          '<span class="count">' + counts[code] + '</span></div>');
+      });
+    }
+    document.getElementById("charts").innerHTML = out.join("");
+    document.getElementById("status").textContent = visible.length + " of " + total + " papers";
+  }
+
+  var rendered = {}, frame = null;
+  function renderRows(reset) {
+    if (reset) { spacer.innerHTML = ""; rendered = {}; }
+    var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+    var last = Math.min(visible.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+    for (var position in rendered) {
+      if (position < first || position >= last) { spacer.removeChild(rendered[position]); delete rendered[position]; }
+    }
+    for (var p = first; p < last; p++) {
+      if (rendered[p]) continue;
+      var i = visible[p], row = document.createElement("div");
+      row.className = "row" + (i === selected ? " selected" : "");
+      row.style.top = p * ROW_HEIGHT + "px";
+      row.dataset.index = i;
+      ["number", "title", "year", "category", "llm"].forEach(function (key) {
+        var cell = document.createElement("div"), text = value(key, i);
+        cell.textContent = text === null ? "" : text;
+        cell.title = cell.textContent;
+        row.appendChild(cell);
+      });
+      spacer.appendChild(row);
+      rendered[p] = row;
+    }
+  }
+
+  function showDetail(i) {
+    if (!details) details = JSON.parse(document.getElementById("details-data").textContent);
+    selected = i;
+    var out = ["<h1>" + escapeHtml(rows.title[i]) + "</h1><dl>"];
+    out.push("<dt>#</dt><dd>" + (rows.number[i] === null ? "" : rows.number[i]) + "</dd>");
+    ["year", "category", "model"].forEach(function (name) {
+      out.push("<dt>" + name.charAt(0).toUpperCase() + name.slice(1) + "</dt><dd>" + escapeHtml(value(name, i)) + "</dd>");
+    });
+    details.columns.forEach(function (column, c) {
+      if (details.rows[i][c]) out.push("<dt>" + escapeHtml(column) + "</dt><dd>" + escapeHtml(details.rows[i][c]) + "</dd>");
+    });
+    document.getElementById("detail").innerHTML = out.join("") + "</dl>";
+    renderRows(true);
+  }
+
+  function escapeHtml(text) {
+    return String(text).replace(/[&<>"]/g, function (c) { return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]; });
+  }
+
+  viewport.addEventListener("scroll", function () {
+    if (frame === null) frame = requestAnimationFrame(function () { frame = null; renderRows(false); });
+  });
+  window.addEventListener("resize", function () { renderRows(false); });
+  spacer.addEventListener("click", function (event) {
+    var row = event.target.closest(".row");
+    if (row) showDetail(Number(row.dataset.index));
+  });
+  document.getElementById("charts").addEventListener("click", function (event) {
+    var bar = event.target.closest(".bar");
+    if (!bar) return;
+    var name = bar.dataset.dim, code = Number(bar.dataset.code);
+    filters[name] = filters[name] === code ? null : code;
+    applyFilters();
+  });
+  document.getElementById("header").addEventListener("click", function (event) {
+    var key = event.target.dataset.sort;
+    if (!key) return;
+    sortDir = key === sortKey ? -sortDir : 1;
+    sortKey = key;
+    applyFilters();
+  });
+  var searchTimer = null;
+  document.getElementById("search").addEventListener("input", function (event) {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(function () { query = event.target.value.trim().toLowerCase(); applyFilters(); }, 150);
+  });
+  document.getElementById("clear").addEventListener("click", function () {
+    filters = {category: null, year: null, model: null};
+    query = "";
+    document.getElementById("search").value = "";
+    applyFilters();
+  });
+
+  applyFilters();
+})();
+</script>
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the offline HTML review dashboard")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    df = slr_data.load_sheet(EXCEL_PATH, None)
+    validate_slr_data.print_summary(validate_slr_data.validate_file(df, EXCEL_PATH))
+    write_dashboard(df, args.output)
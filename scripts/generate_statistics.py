@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Review statistics as LaTeX macros
+
+Computes the RQ1 numbers (papers per year period, model types, venue tiers)
+in one pass over the SLR-Deep sheet and writes them to
+sections/statistics.tex as \\newcommand macros, e.g. \\NumOpenWeight and
+\\PctArxiv, which draft.tex inputs in its preamble. The sections use the
+macros instead of typed numbers (write \\PctArxiv\\% for a percentage), so
+they follow the data without a separate verification pass.
+
+The file is only rewritten when a value changes, so an unchanged sheet does
+not touch its mtime or trigger a LaTeX rerun.
+
+Usage (from the repository root):
+    python scripts/generate_statistics.py
+"""
+
+import os
+import sys
+from collections import Counter
+
+import pandas as pd
+
+import clean_bibliography
+import verify_rq1_claims
+from venue_resolver import VenueResolver
+
+EXCEL_PATH = "./SLR.xlsx"
+BIB_PATH = verify_rq1_claims.BIB_PATH
+OUTPUT_PATH = "./sections/statistics.tex"
+
+# Macro name parts (LaTeX macro names cannot contain digits)
+PERIOD_NAMES = {
+    "2020": "TwentyTwenty",
+    "2021-2022": "TwentyOneToTwentyTwo",
+    "2023": "TwentyThree",
+    "2024-2025": "TwentyFourToTwentyFive",
+}
+MODEL_NAMES = {
+    "open-weight": "OpenWeight",
+    "proprietary": "Proprietary",
+    "custom": "Custom",
+    "unknown": "UnknownModel",
+}
+VENUE_NAMES = {
+    "arxiv": "Arxiv",
+    "top-tier": "TopTier",
+    "specialized": "Specialized",
+}
+
+
+def percentage(count, total):
+    return round(count / total * 100) if total else 0
+
+
+def compute_statistics(df, matches):
+    """{macro name: value} for every statistic, from a single pass over the rows"""
+    periods, models, venues = Counter(), Counter(), Counter()
+    resolver = VenueResolver()
+
+    for idx, row in df.iterrows():
+        year = pd.to_numeric(row.get("Year"), errors="coerce")
+        if pd.notna(year):
+            periods[verify_rq1_claims.year_period(int(year))] += 1
+        models[verify_rq1_claims.classify_model_type(row.get("LLM", ""))] += 1
+        bib_info = matches.get(idx, {}).get("bib_info", {})
+        venues[resolver.resolve(bib_info.get("venue_title", ""), bib_info.get("type", "").lower())["tier"]] += 1
+
+    resolver.save()
+
+    total = len(df)
+    stats = {"NumPapers": total, "NumMatched": len(matches)}
+    for period, name in PERIOD_NAMES.items():
+        stats[f"NumPapers{name}"] = periods[period]
+    stats["NumPapersInPeriods"] = sum(periods[period] for period in PERIOD_NAMES)
+    for model_type, name in MODEL_NAMES.items():
+        stats[f"Num{name}"] = models[model_type]
+        stats[f"Pct{name}"] = percentage(models[model_type], total)
+    for tier, name in VENUE_NAMES.items():
+        stats[f"Num{name}"] = venues[tier]
+        stats[f"Pct{name}"] = percentage(venues[tier], total)
+    return stats
+
+
+def render_macros(stats):
+    lines = [f"% Generated by scripts/generate_statistics.py from {os.path.basename(EXCEL_PATH)}; do not edit\n"]
+    lines += [f"\\newcommand{{\\{name}}}{{{value}}}\n" for name, value in stats.items()]
+    return "".join(lines)
+
+
+def write_statistics(stats, output_path=OUTPUT_PATH):
+    """Write the macro file atomically if its content changed. Returns True if it was written."""
+    return clean_bibliography.atomic_write(output_path, [render_macros(stats)])
+
+
+if __name__ == "__main__":
+    df = verify_rq1_claims.read_slr_data(EXCEL_PATH)
+    if df is None:
+        sys.exit(1)
+    bib_data = verify_rq1_claims.parse_bib_file(BIB_PATH)
+    matches, _ = verify_rq1_claims.match_papers_to_bib(df, bib_data, BIB_PATH)
+
+    stats = compute_statistics(df, matches)
+    if write_statistics(stats):
+        print(f"✓ Wrote {len(stats)} statistics to {OUTPUT_PATH}")
+    else:
+        print(f"✓ Statistics unchanged ({OUTPUT_PATH})")
@@ -1,11 +1,29 @@
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.io as pio
+"""
+Category sunburst (and treemap) of the SLR-Deep papers
+
+Run on its own, this script reads the CSV export (csv_file_path); watch.py
+calls render_sunburst with the SLR.xlsx frame instead, so re-export the CSV
+after editing the workbook to keep both charts the same.
+
+Usage (csv_file_path is relative to the working directory, e.g. data/):
+    python ../scripts/generate_sunburst.py [--treemap] [--plotly]
+"""
+
+import argparse
+import os
+import sys
+
+import slr_data
+import vector_charts
 
 # Configuration
 csv_file_path = "SLR - SLR-Deep.csv"
+csv_columns = ["#", "title", "Category"]
 # Change the output path to a PDF or SVG file
 output_image_path = "sunburst_chart.pdf"  # Or "sunburst_chart.svg"
+# Resolved from the repository root, so it does not depend on the working directory
+treemap_image_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "output", "treemap.svg")
 max_depth = 18
 
 # Professional color palette
@@ -22,10 +40,10 @@ color_palette = [
     "#45B8AC",
 ]
 
-try:
-    # Load and clean data
-    df = pd.read_csv(csv_file_path)
-    df = df[df["#"].notna() & (df["#"] <= max_depth)]
+
+def prepare_sunburst_data(df):
+    """Filter and clean the SLR-Deep rows used by the chart"""
+    df = df[df["#"].notna() & (df["#"] <= max_depth)].copy()
 
     if "title" not in df.columns or "Category" not in df.columns:
         raise ValueError("CSV must contain 'title' and 'Category' columns.")
@@ -38,6 +56,22 @@ try:
         lambda x: x if len(x) <= 20 else (x[:17] + "...")
     )
     # --- END NEW ---
+    return df
+
+
+def category_hierarchy(df):
+    """[(category, color, [display titles])] in order of first appearance"""
+    hierarchy = {}
+    for cat, title in zip(df["Category"], df["display_title"]):
+        if cat not in hierarchy:
+            hierarchy[cat] = (cat, color_palette[len(hierarchy) % len(color_palette)], [])
+        hierarchy[cat][2].append(title)
+    return list(hierarchy.values())
+
+
+def build_sunburst_figure(df):
+    """Build the Category -> title sunburst figure from prepared data"""
+    import plotly.graph_objects as go
 
     # Build labels and hierarchy
     labels = []
@@ -82,12 +116,88 @@ try:
         # width=800, # Example width - uncomment and adjust if needed
         # height=800, # Example height - uncomment and adjust if needed
     )
+    return fig
+
+
+def build_treemap_figure(df):
+    """Build the Category -> title treemap figure from prepared data"""
+    import plotly.graph_objects as go
+
+    labels, parents, colors = [], [], []
+    for cat, color, titles in category_hierarchy(df):
+        labels.append(cat)
+        parents.append("")
+        colors.append(color)
+        labels.extend(titles)
+        parents.extend([cat] * len(titles))
+        colors.extend([color] * len(titles))
 
-    # Save image as PDF (or SVG)
-    pio.write_image(fig, output_image_path)
-    print(f"Sunburst chart saved to {output_image_path}")
+    fig = go.Figure(go.Treemap(labels=labels, parents=parents, marker=dict(colors=colors),
+                               branchvalues="total"))
+    fig.update_layout(margin=dict(t=50, l=0, r=0, b=50), paper_bgcolor="white")
+    return fig
+
+
+def render_chart(df, output_path, kind="sunburst", backend="native"):
+    """
+    Prepare data and save the chart. SVG and PDF are drawn natively in
+    milliseconds (vector_charts.py); backend="plotly", or any other format,
+    exports the plotly figure through Kaleido.
+    """
+    df = prepare_sunburst_data(df)
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    native = backend == "native" and os.path.splitext(output_path)[1].lower() in (".svg", ".pdf")
+    if native:
+        hierarchy = category_hierarchy(df)
+        drawing = (vector_charts.sunburst_drawing(hierarchy) if kind == "sunburst"
+                   else vector_charts.treemap_drawing(hierarchy))
+        drawing.save(output_path)
+    else:
+        import plotly.io as pio
+
+        fig = build_sunburst_figure(df) if kind == "sunburst" else build_treemap_figure(df)
+        pio.write_image(fig, output_path)
+    print(f"{kind.capitalize()} chart saved to {output_path}")
+
+
+def render_sunburst(df, output_path=output_image_path, backend="native"):
+    """Prepare data, build the sunburst and save it as PDF (or SVG)"""
+    render_chart(df, output_path, "sunburst", backend)
+
+
+def render_treemap(df, output_path=treemap_image_path, backend="native"):
+    """Prepare data, build the treemap and save it as SVG (or PDF)"""
+    render_chart(df, output_path, "treemap", backend)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the category sunburst and treemap")
+    parser.add_argument("--treemap", action="store_true", help="also render the treemap")
+    parser.add_argument("--plotly", action="store_true",
+                        help="export through plotly/Kaleido instead of the native renderer")
+    args = parser.parse_args()
+    backend = "plotly" if args.plotly else "native"
+
+    try:
+        # Load the needed columns, dropping rows past max_depth while reading
+        df = slr_data.load_csv(
+            csv_file_path,
+            csv_columns,
+            row_filter=lambda chunk: chunk["#"].notna() & (chunk["#"] <= max_depth),
+        )
+    except FileNotFoundError:
+        print(f"File not found: {csv_file_path}")
+        sys.exit(1)
 
-except FileNotFoundError:
-    print(f"File not found: {csv_file_path}")
-except Exception as e:
-    print(f"Error: {e}")
+    try:
+        render_sunburst(df, backend=backend)
+        if args.treemap:
+            render_treemap(df, backend=backend)
+    except OSError as e:
+        print(f"Could not write chart {e.filename}: {e.strerror}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -1,38 +1,95 @@
 # -*- coding: utf-8 -*-
 
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
 import pandas as pd
 import re
 
-
-def generate_latex_table(data, columns_to_display, caption, label, bib_data, column_mapping):
+import citation_matches
+import slr_data
+import table_pdfs
+import validate_slr_data
+
+
+class RowFragments:
+    """
+    Rendered LaTeX of table rows, cached in FRAGMENT_CACHE_PATH under a hash
+    of the row's cells, the table columns, the bibliography and the escaping
+    rules, so only rows whose inputs changed are rendered again.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or FRAGMENT_CACHE_PATH
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            cache = {}
+        self.fragments = cache.get("rows", {}) if cache.get("version") == FRAGMENT_VERSION else {}
+        self.used = set()
+        self.rendered = 0
+
+    def key(self, columns, citations, title, cells, year, number):
+        rules = [sorted(LATEX_REPLACEMENTS.items()), columns, citations.bib_hash]
+        data = json.dumps([rules, title, cells, year, number], ensure_ascii=False)
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+    def get(self, key, render):
+        """Cached fragment for key, or render() it"""
+        self.used.add(key)
+        if key not in self.fragments:
+            self.fragments[key] = render()
+            self.rendered += 1
+        return self.fragments[key]
+
+    def save(self):
+        """Write the fragments used since the last save, dropping stale rows"""
+        self.fragments = {key: self.fragments[key] for key in self.used}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": FRAGMENT_VERSION, "rows": self.fragments}, f, ensure_ascii=False)
+        self.used = set()
+        self.rendered = 0
+
+
+def render_row(title_text, cells, year, number, citations):
+    """LaTeX source of one table row"""
+    paper_id = create_paper_citation(title_text, citations, year, number)
+
+    # Build row with line breaks
+    row_cells = [paper_id] + [clean_latex_text(cell, LATEX_REPLACEMENTS) for cell in cells]
+
+    # add blank line after each row
+    return " & ".join(row_cells) + " \\\\\n\n"
+
+
+def generate_latex_table(data, columns_to_display, caption, label, citations, column_mapping, fragments):
     """Generate a clean LaTeX longtable"""
 
-    # Special character replacements
-    replacements = {
-        "∆": "\\ensuremath{\\Delta}",
-        "Δ": "\\ensuremath{\\Delta}",
-        "α": "\\ensuremath{\\alpha}",
-        "μ": "\\ensuremath{\\mu}",
-        "~": "\\textasciitilde{}",
-        "^": "\\textasciicircum{}",
-    }
-
-    # Create column format with vertical lines - use appropriate widths that sum to less than 1.0
-    num_cols = len(columns_to_display) + 1  # +1 for Paper column
-    if num_cols == 2:
-        col_format = "|p{0.3\\linewidth}|p{0.6\\linewidth}|"
-    elif num_cols == 3:
-        col_format = "|p{0.25\\linewidth}|p{0.35\\linewidth}|p{0.35\\linewidth}|"
-    elif num_cols == 4:
-        col_format = "|p{0.2\\linewidth}|p{0.25\\linewidth}|p{0.25\\linewidth}|p{0.25\\linewidth}|"
-    elif num_cols == 7:
-        # For 7 columns: Paper, LLM, Dataset, Result, Context Aware, Categ Context, Representation Context
-        col_format = "|p{0.12\\linewidth}|p{0.12\\linewidth}|p{0.12\\linewidth}|p{0.18\\linewidth}|p{0.12\\linewidth}|p{0.12\\linewidth}|p{0.12\\linewidth}|"
-    else:
-        # For other cases, distribute evenly but keep under 0.9 total width
-        col_width = 0.9 / num_cols
-        col_specs = [f"p{{{col_width:.2f}\\linewidth}}"] * num_cols
-        col_format = "|" + "|".join(col_specs) + "|"
+    # Build the cells first so the column widths can follow their content
+    body_rows = []
+    for row in data:
+        # Rows come validated and converted to text by rows_from_dataframe
+        mapped = {n: row[idx] if idx < len(row) else "" for n, idx in column_mapping.items()}
+
+        title_text = mapped.get("title", "").strip()
+        if not title_text or title_text == "[Not specified]":
+            continue
+
+        cells = [mapped.get(col, "[Not specified]").strip() or "[Not specified]"
+                 for col in columns_to_display]
+        body_rows.append((title_text, cells, mapped.get("Year", ""), mapped.get("number", "")))
+
+    headers = ["Paper"] + [col.replace("_", " ").title()
+                           for col in columns_to_display]
+    num_cols = len(headers)
+    widths = column_widths(
+        [[shorten_title(title)] + cells for title, cells, _, _ in body_rows], headers)
+    col_format = "|" + "|".join(f"p{{{width:.3f}\\linewidth}}" for width in widths) + "|"
 
     # Start table with proper longtable structure using hline for vertical line compatibility
     latex_code = (
@@ -43,8 +100,6 @@ def generate_latex_table(data, columns_to_display, caption, label, bib_data, col
     )
 
     # Headers
-    headers = ["Paper"] + [col.replace("_", " ").title()
-                           for col in columns_to_display]
     latex_code += " & ".join(headers) + " \\\\\n"
     latex_code += "\\hline\n\n"
     latex_code += "\\endfirsthead\n\n"
@@ -67,62 +122,22 @@ def generate_latex_table(data, columns_to_display, caption, label, bib_data, col
         "\\endlastfoot\n\n"
     )
 
-    # Process data rows
-    for i, row in enumerate(data):
-        # Handle Excel numeric types and NaN values
-        first_val = row[0] if len(row) > 0 else None
-        if first_val is not None and pd.notna(first_val) and str(first_val).strip():
-            try:
-                if int(float(first_val)) >= 25:
-                    print(row)
-                    continue
-            except (ValueError, TypeError):
-                pass
-
-        # Convert Excel values to strings, handling NaN
-        mapped = {n: str(row[idx]) if idx < len(row) and pd.notna(row[idx]) else ""
-                  for n, idx in column_mapping.items()}
-
-        # Skip header row
-        if mapped.get("number", "").lower() == "number":
-            continue
-
-        title_text = mapped.get("title", "").strip()
-        if not title_text or title_text == "[Not specified]":
-            continue
-
-        paper_id = create_paper_citation(title_text, bib_data)
-
-        # Build row with line breaks
-        row_cells = [paper_id]
-        for col in columns_to_display:
-            cell_content = mapped.get(col, "[Not specified]").strip()
-            if not cell_content:
-                cell_content = "[Not specified]"
-            cell_content = clean_latex_text(cell_content, replacements)
-            row_cells.append(cell_content)
-
-        # add blank line after each row
-        latex_code += " & ".join(row_cells) + " \\\\\n\n"
+    # Process data rows, reusing the fragments of unchanged rows
+    for title_text, cells, year, number in body_rows:
+        key = fragments.key(columns_to_display, citations, title_text, cells, year, number)
+        latex_code += fragments.get(
+            key, lambda: render_row(title_text, cells, year, number, citations))
 
     latex_code += "\\end{longtable}\n\n"
     return latex_code
 
 
-def create_paper_citation(title_text, bib_data):
+def create_paper_citation(title_text, citations, year="", number=""):
     """Create a proper paper citation"""
-    # Try to find matching citation
-    citation_key = None
-    for key, bib_title in bib_data.items():
-        if title_text.lower() in bib_title.lower() or bib_title.lower() in title_text.lower():
-            citation_key = key
-            break
+    # Shared, cached title matching (see citation_matches.py)
+    citation_key = citations.match(title_text, year, number)["key"]
 
-    # Truncate long titles and add citation
-    if len(title_text) > 50:
-        short_title = title_text[:47] + "..."
-    else:
-        short_title = title_text
+    short_title = shorten_title(title_text)
 
     if citation_key:
         return f"{short_title} \\cite{{{citation_key}}}"
@@ -130,6 +145,50 @@ def create_paper_citation(title_text, bib_data):
         return short_title
 
 
+def shorten_title(title_text):
+    """Truncate long titles for the Paper column"""
+    if len(title_text) > 50:
+        return title_text[:47] + "..."
+    return title_text
+
+
+def column_widths(rows, headers):
+    """
+    Fixed column widths (fractions of \\linewidth) from the cell text.
+
+    Widths are proportional to each column's 90th-percentile text length, so
+    cells of a row wrap to a similar number of lines, but never narrower than
+    the column's longest word (or header word). The widths depend only on the
+    data, so longtable sees the same widths on every run and page.
+    """
+    frame = pd.DataFrame(rows, columns=headers).astype(str)
+    if frame.empty:
+        return [round(TABLE_WIDTH / len(headers), 3)] * len(headers)
+
+    lengths = frame.apply(lambda col: col.str.len()).quantile(0.9).to_numpy()
+    longest_word = frame.apply(
+        lambda col: col.str.split().map(lambda words: max(map(len, words), default=0)).max()
+    ).to_numpy()
+    header_word = np.array([max(map(len, header.split())) for header in headers])
+    minimum = np.minimum(np.maximum(longest_word, header_word), MAX_WORD_CHARS) / CHARS_PER_LINEWIDTH
+    # With many columns the minimums alone may not fit; keep room for the text
+    minimum *= min(1.0, MIN_WIDTH_SHARE * TABLE_WIDTH / minimum.sum())
+
+    # Columns that would fall below their minimum are pinned there; the rest
+    # share what is left in proportion to their text length
+    widths = minimum.copy()
+    flexible = np.ones(len(headers), dtype=bool)
+    for _ in range(len(headers)):
+        remaining = TABLE_WIDTH - widths[~flexible].sum()
+        widths[flexible] = remaining * lengths[flexible] / max(lengths[flexible].sum(), 1)
+        pinned = flexible & (widths < minimum)
+        if not pinned.any():
+            break
+        widths[pinned] = minimum[pinned]
+        flexible &= ~pinned
+    return [round(float(width), 3) for width in widths]
+
+
 def clean_latex_text(text, replacements):
     """Clean and escape text for LaTeX"""
     if not text or text == "[Not specified]":
@@ -156,110 +215,148 @@ def clean_latex_text(text, replacements):
     # Remove diacritical marks
     text = re.sub(r"[\u0300-\u036f]", "", text)
 
-    # Truncate very long content
-    if len(text) > 150:
-        text = text[:147] + "..."
-
     return text.strip()
 
 
-def parse_bib_file(path):
-    """Parse bibliography file to extract citation keys and titles"""
-    bib = {}
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        for entry in content.split("@")[1:]:
-            lines = entry.split("\n")
-            if not lines:
-                continue
-
-            header = lines[0]
-            if "{" in header:
-                key = header.split("{", 1)[1].split(",", 1)[0].strip()
-
-                # Look for title
-                for line in lines[1:]:
-                    if "title=" in line.lower():
-                        # Extract title between braces
-                        title_match = re.search(
-                            r'title\s*=\s*\{([^}]+)\}', line, re.IGNORECASE)
-                        if title_match:
-                            title = title_match.group(1).strip()
-                            bib[key] = title
-                            break
-    except FileNotFoundError:
-        print(f"Warning: Bibliography file not found at {path}")
-    except Exception as e:
-        print(f"Warning: Error parsing bibliography file: {e}")
-
-    return bib
+# Paths - use relative paths
+EXCEL_PATH = "./SLR.xlsx"
+BIB_PATH = "./references/bibliography.bib"
+OUTPUT_PATH = "./sections/generated_tables.tex"
+
+# Rendered rows, reused while their inputs are unchanged
+FRAGMENT_CACHE_PATH = os.path.join(slr_data.CACHE_DIR, "table_rows.json")
+# Bump when render_row, create_paper_citation or clean_latex_text output changes
+FRAGMENT_VERSION = "1"
+
+# Special character replacements
+LATEX_REPLACEMENTS = {
+    "∆": "\\ensuremath{\\Delta}",
+    "Δ": "\\ensuremath{\\Delta}",
+    "α": "\\ensuremath{\\alpha}",
+    "μ": "\\ensuremath{\\mu}",
+    "~": "\\textasciitilde{}",
+    "^": "\\textasciicircum{}",
+}
+
+# Column widths: total fraction of \\linewidth, and the text density used to
+# turn a character count into a width
+TABLE_WIDTH = 0.88
+CHARS_PER_LINEWIDTH = 90
+# Longer words (URLs, model lists without spaces) may break instead
+MAX_WORD_CHARS = 8
+# At most this share of the table goes to the per-column minimum widths
+MIN_WIDTH_SHARE = 0.8
+
+# Column mapping - adjust indices based on actual CSV structure
+COLUMN_MAPPING = {
+    "number": 0,
+    "title": 1,
+    "Year": 2,
+    "Type": 3,
+    "LLM": 5,
+    "dataset": 9,
+    "result": 12,
+    "Main strengths": 7,
+    "Main weaknesses": 8,
+    "pipline method used": 14,
+    "context aware": 15,
+    "categ context": 16,
+    "representation context": 17,
+    "context usage in method detail text": 18,
+}
+
+# Define tables to generate
+TABLES = [
+    {
+        "env": "table*",
+        "name": "results",
+        "columns": ["LLM", "Year", "dataset", "result", "context aware",
+                    "categ context",
+                    "representation context",],
+        "caption": "Summary of Results from Reviewed Papers",
+        "label": "results_summary",
+    },
+]
+
+
+# Papers numbered PAPER_LIMIT and above are left out of the tables
+PAPER_LIMIT = 25
+
+# Low-cardinality label columns, loaded as categoricals
+CATEGORICAL_COLUMNS = ["context aware", "categ context", "representation context"]
+
+
+def projected_columns(tables=TABLES):
+    """
+    Sheet positions needed to render `tables`, and the column mapping
+    re-indexed into rows that contain only those positions
+    """
+    names = ["number", "title"] + [col for table in tables for col in table["columns"]]
+    positions = sorted({COLUMN_MAPPING[name] for name in names})
+    mapping = {name: positions.index(COLUMN_MAPPING[name]) for name in names}
+    return positions, mapping
+
+
+def rows_from_dataframe(df):
+    """Convert the SLR-Deep DataFrame to text data rows below PAPER_LIMIT, sorted by #"""
+    df = validate_slr_data.typed_frame(df)
+    df = df[~(df["#"] >= PAPER_LIMIT).fillna(False)]
+    df = df.sort_values("#", na_position="first", kind="stable")
+    # One vectorized conversion of the typed values to text; missing cells become ""
+    return df.astype(object).where(df.notna(), "").astype(str).values.tolist()
+
+
+def render_tables(data_rows, citations, column_mapping=COLUMN_MAPPING, fragments=None):
+    """Render every configured table and return {table name: LaTeX source}"""
+    if fragments is None:
+        fragments = RowFragments()
+    tables = {}
+    for table_config in TABLES:
+        tables[table_config["name"]] = generate_latex_table(
+            data_rows,
+            table_config["columns"],
+            table_config["caption"],
+            table_config["label"],
+            citations,
+            column_mapping,
+            fragments
+        )
+    citations.save()
+    print(f"Rendered {fragments.rendered} changed rows")
+    fragments.save()
+    return tables
+
+
+def write_tables(tables, output_path=OUTPUT_PATH, precompile=False):
+    """
+    Write each rendered table to sections/tables/ and include them from
+    output_path through \\generatedtable, which draft.tex resolves to the
+    precompiled PDF or the inline longtable (see table_pdfs.py)
+    """
+    # The fallback definition keeps the file usable without draft.tex's macro
+    output_content = "\\providecommand{\\generatedtable}[3]{\\input{#1}}\n"
+    for name, latex in tables.items():
+        output_content += table_pdfs.include_line(name, latex, precompile)
+    with open(output_path, "w", encoding="utf-8") as fo:
+        fo.write(output_content)
 
 
 if __name__ == "__main__":
-    # Paths - use relative paths
-    excel_path = "./SLR.xlsx"
-    bib_path = "./references/bibliography.bib"
+    parser = argparse.ArgumentParser(description="Generate the LaTeX tables from SLR.xlsx")
+    parser.add_argument("--precompile", action="store_true",
+                        help="also compile each table into its own PDF under build/tables/")
+    args = parser.parse_args()
 
     try:
-        # Read data from Excel file
-        df = pd.read_excel(excel_path, sheet_name="SLR-Deep")
-        # Convert DataFrame to list of lists format (headers + data rows)
-        rows = [df.columns.tolist()] + df.values.tolist()
-
-        headers, data_rows = rows[0], rows[1:]
-        bib = parse_bib_file(bib_path)
-        # Handle Excel numeric types (may be float/NaN) when sorting
-        data_rows.sort(key=lambda x: int(float(x[0])) if pd.notna(
-            x[0]) and str(x[0]).strip() else 0)
-
-        # Column mapping - adjust indices based on actual CSV structure
-        cmap = {
-            "number": 0,
-            "title": 1,
-            "Year": 2,
-            "Type": 3,
-            "LLM": 5,
-            "dataset": 9,
-            "result": 12,
-            "Main strengths": 7,
-            "Main weaknesses": 8,
-            "pipline method used": 14,
-            "context aware": 15,
-            "categ context": 16,
-            "representation context": 17,
-            "context usage in method detail text": 18,
-        }
-
-        # Define tables to generate
-        tables = [
-            {
-                "env": "table*",
-                "name": "results",
-                "columns": ["LLM", "Year", "dataset", "result", "context aware",
-                            "categ context",
-                            "representation context",],
-                "caption": "Summary of Results from Reviewed Papers",
-                "label": "results_summary",
-            },
-        ]
-
-        # Generate tables
-        output_content = ""
-        for table_config in tables:
-            output_content += generate_latex_table(
-                data_rows,
-                table_config["columns"],
-                table_config["caption"],
-                table_config["label"],
-                bib,
-                cmap
-            )
-
-        # Write to file
-        with open("./sections/generated_tables.tex", "w", encoding="utf-8") as fo:
-            fo.write(output_content)
+        # Read only the columns the tables use from the Excel file
+        positions, mapping = projected_columns()
+        df = slr_data.load_sheet(EXCEL_PATH, positions, categorical=CATEGORICAL_COLUMNS)
+        validate_slr_data.print_summary(validate_slr_data.validate_file(df, EXCEL_PATH))
+        data_rows = rows_from_dataframe(df)
+        citations = citation_matches.CitationMatcher(BIB_PATH)
+
+        # Generate tables and write to file
+        write_tables(render_tables(data_rows, citations, mapping), precompile=args.precompile)
         print("Successfully wrote generated_tables.tex")
 
     except FileNotFoundError as e:
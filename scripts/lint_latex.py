@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Pre-compile LaTeX checks for draft.tex and the sections it inputs
+
+Follows the \\input/\\include graph from draft.tex and tokenizes each file
+once to report, with file and line:
+- \\input files that do not exist
+- \\begin/\\end environments that are unbalanced or mismatched
+- \\ref to labels defined nowhere in the document, and duplicate labels
+- unescaped _ and # outside math, & outside tabular-like environments, and
+  unescaped % in generated files (where it silently comments out the rest
+  of a table row)
+
+Per-file results are cached by content hash in build/cache/latex_lint.json,
+so only edited files are tokenized again; the cross-file label check is
+cheap and always rerun.
+
+Usage (from the repository root):
+    python scripts/lint_latex.py [draft.tex]
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+
+ROOT_PATH = "./draft.tex"
+# In slr_data.CACHE_DIR; not imported from there to keep pandas out of the startup time
+CACHE_PATH = "./build/cache/latex_lint.json"
+
+# Bump when the checks change so cached results are discarded
+LINT_VERSION = "2"
+
+# Files written by scripts/, where a stray % is a generator bug
+GENERATED_FILES = {"sections/generated_tables.tex"}
+GENERATED_DIRS = {"sections/tables"}
+
+# Environments where & separates cells
+ALIGNMENT_ENVIRONMENTS = {
+    "tabular", "tabular*", "tabularx", "longtable", "longtable*", "array", "align", "align*",
+    "alignat", "alignat*", "eqnarray", "eqnarray*", "matrix", "pmatrix", "bmatrix", "cases",
+    "split", "aligned", "gathered", "tabulary", "supertabular",
+}
+MATH_ENVIRONMENTS = {
+    "equation", "equation*", "align", "align*", "alignat", "alignat*", "gather", "gather*",
+    "multline", "multline*", "eqnarray", "eqnarray*", "math", "displaymath",
+}
+VERBATIM_ENVIRONMENTS = {"verbatim", "verbatim*", "lstlisting", "minted", "comment"}
+
+# Commands whose braced argument is a name, path or key rather than text
+_NAME_COMMANDS = (
+    r"label|ref|eqref|pageref|autoref|cref|Cref|nameref|input|include|includegraphics|"
+    r"url|href|bibliography|bibliographystyle|usepackage|documentclass|cite[a-zA-Z]*|"
+    r"citestyle|setcitestyle|begin|end|newcommand|renewcommand|providecommand|"
+    r"newenvironment|renewenvironment|def|setlength|color|textcolor|generatedtable"
+)
+
+TOKEN_PATTERN = re.compile(
+    r"(?P<comment>%[^\n]*)"
+    r"|\\(?P<command>" + _NAME_COMMANDS + r")\*?\s*(?:\[[^\]\n]*\]\s*)?\{(?P<argument>[^{}\n]*)\}"
+    r"|(?P<definition>\\(?:re)?newcommand|\\providecommand|\\def)"
+    r"|(?P<math>\$\$|\$|\\\(|\\\)|\\\[|\\\])"
+    r"|(?P<escaped>\\[^a-zA-Z\n])"
+    # #1 and ## are macro parameters, also in multi-line definitions
+    r"|(?P<special>[&_]|#(?![#\d]))"
+    r"|(?P<newline>\n)"
+)
+_VERBATIM_END = re.compile(r"\\end\{(verbatim\*?|lstlisting|minted|comment)\}")
+
+
+def tokenize_file(path, text):
+    """
+    Check one file on its own. Returns a JSON-serializable dict with the
+    labels, refs and inputs it contains (with line numbers) and its errors.
+    """
+    result = {"labels": [], "refs": [], "inputs": [], "errors": []}
+    environments = []  # (name, line)
+    math = None  # delimiter that opened inline/display math
+    line = 1
+    definition_line = None  # # is a parameter on \newcommand lines
+    generated = (os.path.normpath(path) in {os.path.normpath(p) for p in GENERATED_FILES}
+                 or os.path.dirname(os.path.normpath(path)) in {os.path.normpath(d) for d in GENERATED_DIRS})
+
+    def error(message, at=None):
+        result["errors"].append([at or line, message])
+
+    position = 0
+    while True:
+        match = TOKEN_PATTERN.search(text, position)
+        if match is None:
+            break
+        position = match.end()
+        kind = match.lastgroup if match.lastgroup != "argument" else "command"
+
+        if kind == "newline":
+            line += 1
+        elif kind == "comment":
+            if generated:
+                error("unescaped % comments out the rest of the line")
+        elif kind == "definition":
+            definition_line = line
+        elif kind == "math":
+            delimiter = match.group("math")
+            closing = {"$": "$", "$$": "$$", "\\(": "\\)", "\\[": "\\]"}
+            if math is None and delimiter in closing:
+                math = delimiter
+            elif math is not None and delimiter == closing[math]:
+                math = None
+            else:
+                error(f"unmatched math delimiter {delimiter}")
+        elif kind == "special":
+            char = match.group("special")
+            in_math = math is not None or any(name in MATH_ENVIRONMENTS for name, _ in environments)
+            if char == "&" and not any(name in ALIGNMENT_ENVIRONMENTS for name, _ in environments):
+                error("unescaped & outside a tabular environment")
+            elif char == "_" and not in_math:
+                error("unescaped _ outside math mode")
+            elif char == "#" and definition_line != line:
+                error("unescaped # outside a macro definition")
+        elif kind == "command":
+            command, argument = match.group("command"), match.group("argument").strip()
+            line_of_command = line
+            if command == "begin":
+                if argument in VERBATIM_ENVIRONMENTS:
+                    end = _VERBATIM_END.search(text, position)
+                    skipped = text[position:end.end() if end else len(text)]
+                    line += skipped.count("\n")
+                    position = end.end() if end else len(text)
+                    if not end:
+                        error(f"\\begin{{{argument}}} is never closed", line_of_command)
+                    continue
+                environments.append((argument, line))
+            elif command == "end":
+                if not environments:
+                    error(f"\\end{{{argument}}} without a matching \\begin")
+                elif environments[-1][0] != argument:
+                    name, opened = environments[-1]
+                    error(f"\\end{{{argument}}} closes \\begin{{{name}}} from line {opened}")
+                    # Assume the \end is right if it matches something further out
+                    if any(name == argument for name, _ in environments):
+                        while environments and environments.pop()[0] != argument:
+                            pass
+                else:
+                    environments.pop()
+            elif command in ("newcommand", "renewcommand", "providecommand", "def"):
+                definition_line = line
+            elif command == "label":
+                result["labels"].append([argument, line])
+            elif command in ("ref", "eqref", "pageref", "autoref", "cref", "Cref", "nameref"):
+                for name in argument.split(","):
+                    result["refs"].append([name.strip(), line])
+            elif command in ("input", "include", "generatedtable") and "#" not in argument:
+                result["inputs"].append([argument, line])
+
+    for name, opened in environments:
+        error(f"\\begin{{{name}}} is never closed", opened)
+    if math is not None:
+        error(f"math opened with {math} is never closed")
+    return result
+
+
+def resolve_input(argument, root_dir):
+    path = os.path.join(root_dir, argument)
+    return path if os.path.splitext(path)[1] else path + ".tex"
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return cache.get("files", {}) if cache.get("version") == LINT_VERSION else {}
+
+
+def save_cache(files, path=CACHE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": LINT_VERSION, "files": files}, f)
+
+
+def lint(root_path=ROOT_PATH):
+    """Lint the document rooted at root_path. Returns [(file, line, message)] sorted by file and line."""
+    root_dir = os.path.dirname(root_path) or "."
+    cache = load_cache()
+    results, errors = {}, []
+
+    pending = [os.path.normpath(root_path)]
+    while pending:
+        path = pending.pop()
+        if path in results:
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        cached = cache.get(path)
+        if cached and cached["sha1"] == digest:
+            result = cached["result"]
+        else:
+            result = tokenize_file(os.path.relpath(path, root_dir), data.decode("utf-8", errors="replace"))
+            cache[path] = {"sha1": digest, "result": result}
+        results[path] = result
+
+        for argument, line in result["inputs"]:
+            child = os.path.normpath(resolve_input(argument, root_dir))
+            if os.path.isfile(child):
+                pending.append(child)
+            else:
+                errors.append((path, line, f"\\input file not found: {argument}"))
+
+    # Keep the cache to the files still in the document
+    save_cache({path: cache[path] for path in results})
+
+    labels = {}
+    for path, result in results.items():
+        errors.extend((path, line, message) for line, message in result["errors"])
+        for name, line in result["labels"]:
+            if name in labels:
+                first_path, first_line = labels[name]
+                errors.append((path, line, f"duplicate \\label{{{name}}} (first at {first_path}:{first_line})"))
+            else:
+                labels[name] = (path, line)
+    for path, result in results.items():
+        for name, line in result["refs"]:
+            if name not in labels:
+                errors.append((path, line, f"\\ref to undefined label {name}"))
+
+    return sorted(errors), len(results)
+
+
+if __name__ == "__main__":
+    root_path = sys.argv[1] if len(sys.argv) > 1 else ROOT_PATH
+    if not os.path.isfile(root_path):
+        print(f"✗ File not found: {root_path}")
+        sys.exit(1)
+
+    errors, file_count = lint(root_path)
+    for path, line, message in errors:
+        print(f"{path}:{line}: {message}")
+    if errors:
+        print(f"✗ {len(errors)} problems in {file_count} files")
+        sys.exit(1)
+    print(f"✓ No problems in {file_count} files")
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Reference-list coverage check against our bibliographies
+
+Splits the plain-text reference list at the end of references/Reference SLR.txt
+into structured records (number, authors, title, venue, year) and matches each
+record to the entries of references/*.bib through a character-trigram index
+over normalized titles. Writes a markdown report with the coverage, the
+matched pairs, the references we do not have, and our entries that the
+reference list does not cite.
+"""
+
+import glob
+import re
+import sys
+from collections import Counter, defaultdict
+
+import clean_bibliography
+
+REFERENCE_TEXT_PATH = "./references/Reference SLR.txt"
+BIB_GLOB = "./references/*.bib"
+OUTPUT_PATH = "./reference_coverage_report.md"
+
+# Dice similarity of title trigram sets needed to accept a match
+MATCH_THRESHOLD = 0.6
+
+HEADING_PATTERN = re.compile(r"^\s*(references|bibliography)\s*$", re.IGNORECASE)
+RECORD_START = re.compile(r"^\[(\d+)\]\s+")
+PAGE_NUMBER_LINE = re.compile(r"^\s*\d{1,4}\s*$")
+AUTHOR_PATTERN = re.compile(
+    r"^(?:(?:[A-Z][a-z]?\.\s?-?)+\s*[\w'’\-À-ɏ\u0300-\u036f]+(?:\s+[\w'’\-À-ɏ\u0300-\u036f]+)*"
+    r"|et al\.?|[A-Z]{2,}(?:\s[A-Z]{2,})*)$"
+)
+YEAR_PATTERN = re.compile(r"\b(19|20)\d{2}\b")
+
+
+def read_reference_records(path=REFERENCE_TEXT_PATH):
+    """Return [(number, text)] for the numbered records after the last References heading"""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    start = max((i for i, line in enumerate(lines) if HEADING_PATTERN.match(line)), default=None)
+    if start is None:
+        return []
+
+    records = []
+    for line in lines[start + 1:]:
+        if PAGE_NUMBER_LINE.match(line):
+            continue
+        match = RECORD_START.match(line)
+        if match:
+            records.append([int(match.group(1)), line[match.end():].strip()])
+        elif records and line.strip():
+            text = records[-1][1]
+            # Undo line-break hyphenation only inside a word ("front-" + "end")
+            joiner = "" if text.endswith("-") else " "
+            records[-1][1] = text + joiner + line.strip()
+    return [(number, text) for number, text in records]
+
+
+def parse_reference(number, text):
+    """
+    Split a reference of the form
+        Authors, Title, in: Venue, Publisher, Year, pp. ...   or
+        Authors, Title, Journal Vol (Issue) (Year) pages.
+    into a dict. Fields that cannot be recovered are left empty.
+    """
+    parts = [part.strip() for part in text.split(", ")]
+    authors = []
+    while len(parts) > 1 and AUTHOR_PATTERN.match(parts[0]):
+        authors.append(parts.pop(0))
+    rest = ", ".join(parts)
+
+    years = [match.group(0) for match in YEAR_PATTERN.finditer(rest)]
+    year = years[-1] if years else ""
+
+    if ", in: " in rest:
+        title, venue = rest.split(", in: ", 1)
+        venue = re.split(r",\s*(?:(?:19|20)\d{2}|pp\.)", venue)[0]
+    else:
+        journal = re.match(r"^(?P<title>.+), (?P<venue>[^,]+?)\s+[\w\-]+\s*(?:\([\w\-]+\)\s*)?\((?:19|20)\d{2}\)", rest)
+        if journal:
+            title, venue = journal.group("title"), journal.group("venue")
+        else:
+            # "Title (Year)." or an unusual layout: keep what precedes the year
+            title = re.split(r"\s*\(?(?:19|20)\d{2}\)?", rest)[0]
+            venue = ""
+
+    return {
+        "number": number,
+        "authors": authors,
+        "title": title.strip(" ."),
+        "venue": venue.strip(" ."),
+        "year": year,
+        "text": text,
+    }
+
+
+def normalize_title(title):
+    return re.sub(r"[^a-z0-9]+", " ", re.sub(r"[{}\\]", "", title).lower()).strip()
+
+
+def trigrams(title):
+    text = f"  {normalize_title(title)} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def load_bib_entries(pattern=BIB_GLOB):
+    """Return {citation key: {'title', 'year', 'file'}} for every bib file (first key wins)"""
+    entries = {}
+    for path in sorted(glob.glob(pattern)):
+        for entry in clean_bibliography.parse_bibtex(path):
+            if entry.key in entries:
+                continue
+            fields = dict(clean_bibliography.parse_fields(entry.content))
+            title = fields.get("title", "").strip('{}" ')
+            if title:
+                entries[entry.key] = {
+                    "title": title,
+                    "year": fields.get("year", "").strip('{}" '),
+                    "file": path,
+                }
+    return entries
+
+
+class TrigramIndex:
+    """Inverted index from title trigrams to bib keys, scored with Dice similarity."""
+
+    def __init__(self, entries):
+        self.sizes = {}
+        self.postings = defaultdict(list)
+        for key, entry in entries.items():
+            grams = trigrams(entry["title"])
+            self.sizes[key] = len(grams)
+            for gram in grams:
+                self.postings[gram].append(key)
+
+    def best_match(self, title):
+        """Return (key, score) of the most similar title, or (None, 0.0)"""
+        grams = trigrams(title)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        best_key, best_score = None, 0.0
+        for key, count in shared.items():
+            score = 2 * count / (len(grams) + self.sizes[key])
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key, best_score
+
+
+def match_references(references, entries):
+    """Split references into matched [(ref, key, score)] and unmatched [(ref, best key, score)]"""
+    index = TrigramIndex(entries)
+    matched, unmatched = [], []
+    for ref in references:
+        key, score = index.best_match(ref["title"])
+        if key and score >= MATCH_THRESHOLD:
+            matched.append((ref, key, score))
+        else:
+            unmatched.append((ref, key, score))
+    return matched, unmatched
+
+
+def generate_report(references, entries, matched, unmatched, output_path=OUTPUT_PATH):
+    """Write the markdown coverage report"""
+    cited_keys = {key for _, key, _ in matched}
+    uncited = sorted(key for key in entries if key not in cited_keys)
+    coverage = len(matched) / len(references) * 100 if references else 0.0
+
+    report = []
+    report.append("# Reference List Coverage Report\n")
+    report.append(f"Reference list: `{REFERENCE_TEXT_PATH}`\n")
+    report.append(f"**References parsed:** {len(references)}\n")
+    report.append(f"**Bib entries:** {len(entries)}\n")
+    report.append(f"**Matched:** {len(matched)} ({coverage:.1f}%)\n\n")
+
+    report.append("## Matched References\n")
+    report.append("| # | Title | Key | Score | Year |\n")
+    report.append("|---|-------|-----|-------|------|\n")
+    for ref, key, score in matched:
+        year = ref["year"]
+        year_status = year if year == entries[key]["year"] else f"{year} ✗ (bib: {entries[key]['year']})"
+        report.append(f"| {ref['number']} | {ref['title']} | `{key}` | {score:.2f} | {year_status} |\n")
+
+    report.append("\n## References Missing from the Bibliography\n")
+    for ref, key, score in unmatched:
+        hint = f" (closest: `{key}`, {score:.2f})" if key else ""
+        report.append(f"- [{ref['number']}] {ref['title']} ({ref['year'] or 'n.d.'}){hint}\n")
+
+    report.append("\n## Bib Entries Not in the Reference List\n")
+    for key in uncited:
+        report.append(f"- `{key}`: {entries[key]['title']} ({entries[key]['file']})\n")
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("".join(report))
+    print(f"✓ Generated coverage report: {output_path}")
+
+
+if __name__ == "__main__":
+    records = read_reference_records()
+    if not records:
+        print(f"✗ No reference list found in {REFERENCE_TEXT_PATH}")
+        sys.exit(1)
+    references = [parse_reference(number, text) for number, text in records]
+    print(f"✓ Parsed {len(references)} references")
+
+    entries = load_bib_entries()
+    print(f"✓ Loaded {len(entries)} bib entries")
+
+    matched, unmatched = match_references(references, entries)
+    print(f"✓ Matched {len(matched)}/{len(references)} references")
+    generate_report(references, entries, matched, unmatched)
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk screening of database search exports
+
+Streams search-result exports (CSV from Scopus/IEEE/ACM/Springer, RIS, or
+BibTeX) in chunks, removes records already in the bibliography or seen
+earlier in the import (hashed DOI and normalized title), and applies the
+inclusion/exclusion rules of sections/research_method.tex as vectorized
+filters. Included records are written to a candidate sheet; excluded and
+duplicate records go to a companion sheet with the reason, so every
+screening decision is documented.
+
+Rules can be overridden with a JSON file holding any of the DEFAULT_RULES keys.
+
+Usage (from the repository root):
+    python scripts/screen_search_results.py exports/*.csv exports/*.ris \\
+        [--rules rules.json] [--output build/screened_candidates.csv]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import clean_bibliography
+
+BIB_PATHS = ["./references/bibliography.bib", "./references/SLR.bib", "./references/bib2.bib"]
+OUTPUT_PATH = "./build/screened_candidates.csv"
+CHUNK_ROWS = 20_000
+
+FIELDS = ["title", "authors", "year", "doi", "venue", "abstract", "keywords", "type", "language", "source"]
+
+# Inclusion/exclusion criteria from research_method.tex
+DEFAULT_RULES = {
+    # Every group must match title, abstract or keywords (search string groups)
+    "term_groups": [
+        ["steganograph", "watermark", "information hiding"],
+        ["large language model", "llm", "bert", "lama", "llama", "gpt"],
+    ],
+    "min_year": 2018,  # IC2
+    "languages": ["english", "en", "eng"],  # IC2 / EC3, when the export has a language
+    "exclude_types": ["thesis", "phdthesis", "mastersthesis", "dissertation", "book", "inbook",
+                      "book chapter", "incollection", "preprint", "unpublished", "editorial"],  # EC4
+}
+
+# Export column names (lowercased) for each field
+FIELD_ALIASES = {
+    "title": ["title", "document title", "article title", "item title"],
+    "authors": ["authors", "author", "author full names"],
+    "year": ["year", "publication year", "publication_year", "pubyear"],
+    "doi": ["doi"],
+    "venue": ["source title", "publication title", "journal", "booktitle", "publication", "venue"],
+    "abstract": ["abstract"],
+    "keywords": ["author keywords", "keywords", "index keywords", "author_keywords"],
+    "type": ["document type", "type", "content type", "item type"],
+    "language": ["language of original document", "language"],
+}
+
+# RIS tags for each field; repeated tags are joined
+RIS_TAGS = {
+    "TI": "title", "T1": "title", "AU": "authors", "A1": "authors",
+    "PY": "year", "Y1": "year", "DA": "year", "DO": "doi",
+    "JO": "venue", "JF": "venue", "T2": "venue", "BT": "venue",
+    "AB": "abstract", "N2": "abstract", "KW": "keywords", "TY": "type", "LA": "language",
+}
+
+# RIS TY codes in the BibTeX-style type vocabulary of the rules
+RIS_TYPES = {
+    "JOUR": "article", "EJOUR": "article", "CONF": "inproceedings", "CPAPER": "inproceedings",
+    "THES": "thesis", "CHAP": "inbook", "ECHAP": "inbook", "BOOK": "book", "EBOOK": "book",
+    "EDBOOK": "book", "UNPB": "unpublished", "MANSCPT": "unpublished", "RPRT": "techreport",
+}
+
+# BibTeX fields for each field
+BIB_FIELDS = {"title": "title", "author": "authors", "year": "year", "doi": "doi",
+              "journal": "venue", "booktitle": "venue", "abstract": "abstract",
+              "keywords": "keywords", "language": "language"}
+
+
+# --- Readers: each yields DataFrames of at most CHUNK_ROWS records ----------
+
+def _frame(records, source):
+    df = pd.DataFrame.from_records(records, columns=FIELDS[:-1]) if records else pd.DataFrame(columns=FIELDS[:-1])
+    df["source"] = source
+    return df
+
+
+def read_csv_export(path):
+    for chunk in pd.read_csv(path, dtype=str, chunksize=CHUNK_ROWS, keep_default_na=False):
+        columns = {col.lower().strip(): col for col in chunk.columns}
+        df = pd.DataFrame(index=chunk.index)
+        for field, aliases in FIELD_ALIASES.items():
+            column = next((columns[alias] for alias in aliases if alias in columns), None)
+            df[field] = chunk[column] if column else ""
+        df["source"] = os.path.basename(path)
+        yield df[FIELDS]
+
+
+def read_ris_export(path):
+    records, record = [], {}
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for line in f:
+            tag, _, value = line.partition("  - ")
+            tag, value = tag.strip(), value.strip()
+            if tag == "ER":
+                records.append(record)
+                record = {}
+                if len(records) >= CHUNK_ROWS:
+                    yield _frame(records, os.path.basename(path))
+                    records = []
+            elif tag in RIS_TAGS and value:
+                field = RIS_TAGS[tag]
+                separator = " and " if field == "authors" else "; "
+                if field == "year":
+                    value = value[:4]
+                elif field == "type":
+                    value = RIS_TYPES.get(value.upper(), value)
+                record[field] = f"{record[field]}{separator}{value}" if field in record else value
+    if records:
+        yield _frame(records, os.path.basename(path))
+
+
+def read_bib_export(path):
+    records = []
+    for entry in clean_bibliography.parse_bibtex(path):
+        record = {"type": entry.entry_type}
+        for name, raw_value in clean_bibliography.parse_fields(entry.content):
+            field = BIB_FIELDS.get(name)
+            if field and field not in record:
+                record[field] = raw_value.strip('{}" ')
+        records.append(record)
+        if len(records) >= CHUNK_ROWS:
+            yield _frame(records, os.path.basename(path))
+            records = []
+    if records:
+        yield _frame(records, os.path.basename(path))
+
+
+READERS = {".csv": read_csv_export, ".ris": read_ris_export, ".bib": read_bib_export}
+
+
+# --- Normalization and dedup keys -------------------------------------------
+
+def normalize_titles(titles):
+    """Lowercase, drop LaTeX braces and punctuation, collapse whitespace"""
+    return (titles.fillna("").astype(str).str.lower()
+            .str.replace(r"[^a-z0-9]+", " ", regex=True).str.strip())
+
+
+def normalize_dois(dois):
+    return (dois.fillna("").astype(str).str.lower().str.strip()
+            .str.replace(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", "", regex=True)
+            .str.replace(r"^(null|none|n/a)$", "", regex=True))
+
+
+def hash_keys(keys):
+    """64-bit hashes of non-empty keys; empty keys hash to 0 and never match"""
+    hashed = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    return np.where(keys.to_numpy() == "", np.uint64(0), hashed)
+
+
+def bibliography_keys(bib_paths):
+    """Hashed DOIs and normalized titles already present in the bibliography"""
+    titles, dois = [], []
+    for path in bib_paths:
+        if not os.path.exists(path):
+            continue
+        for chunk in read_bib_export(path):
+            titles.append(chunk["title"])
+            dois.append(chunk["doi"])
+    if not titles:
+        return set(), set()
+    title_hashes = set(hash_keys(normalize_titles(pd.concat(titles, ignore_index=True))).tolist())
+    doi_hashes = set(hash_keys(normalize_dois(pd.concat(dois, ignore_index=True))).tolist())
+    title_hashes.discard(0)
+    doi_hashes.discard(0)
+    return title_hashes, doi_hashes
+
+
+# --- Screening ----------------------------------------------------------------
+
+def _any_term_pattern(terms):
+    escaped = "|".join(term.replace(" ", r"\s+") for term in map(str.lower, terms))
+    return rf"\b(?:{escaped})"
+
+
+def _as_array(hashes):
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def _known_mask(title_hash, doi_hash, keys):
+    titles, dois = keys
+    return ((np.isin(title_hash, _as_array(titles)) & (title_hash != 0))
+            | (np.isin(doi_hash, _as_array(dois)) & (doi_hash != 0)))
+
+
+def screen_chunk(df, rules, bib_keys, seen_keys):
+    """
+    Add 'reason' to a chunk: '' for included records, otherwise the first
+    failing check. bib_keys and seen_keys are (title hashes, DOI hashes) sets
+    for the bibliography and for records earlier in the import; seen_keys
+    is updated with every non-duplicate record of the chunk.
+    """
+    title_hash = hash_keys(normalize_titles(df["title"]))
+    doi_hash = hash_keys(normalize_dois(df["doi"]))
+
+    in_bib = _known_mask(title_hash, doi_hash, bib_keys)
+    # Seen in an earlier chunk, or earlier in this one (first occurrence kept)
+    seen_before = _known_mask(title_hash, doi_hash, seen_keys) | \
+        (pd.Series(title_hash).duplicated().to_numpy() & (title_hash != 0)) | \
+        (pd.Series(doi_hash).duplicated().to_numpy() & (doi_hash != 0))
+
+    text = (df["title"].fillna("") + " " + df["abstract"].fillna("") + " "
+            + df["keywords"].fillna("")).str.lower()
+    term_mask = np.ones(len(df), dtype=bool)
+    for group in rules.get("term_groups", []):
+        term_mask &= text.str.contains(_any_term_pattern(group), regex=True).to_numpy()
+
+    year = pd.to_numeric(df["year"].astype(str).str.extract(r"(\d{4})")[0], errors="coerce")
+    year_mask = ~(year < rules.get("min_year", 0)).to_numpy()
+
+    language = df["language"].fillna("").astype(str).str.lower().str.strip()
+    languages = [lang.lower() for lang in rules.get("languages", [])]
+    language_mask = ((language == "") | language.isin(languages)).to_numpy() if languages else True
+
+    doc_type = df["type"].fillna("").astype(str).str.strip()
+    # RIS codes also appear in some CSV exports' type column
+    doc_type = doc_type.str.upper().map(RIS_TYPES).fillna(doc_type).str.lower()
+    excluded_types = [t.lower() for t in rules.get("exclude_types", [])]
+    type_mask = ~doc_type.isin(excluded_types).to_numpy()
+
+    df = df.copy()
+    df["reason"] = np.select(
+        [in_bib, seen_before, ~term_mask, ~year_mask, ~np.asarray(language_mask), ~type_mask],
+        ["already in bibliography", "duplicate in import", "search terms not matched",
+         f"published before {rules.get('min_year')}", "not in English", "excluded publication type"],
+        default="",
+    )
+
+    new = ~(in_bib | seen_before)
+    seen_keys[0].update(title_hash[new & (title_hash != 0)].tolist())
+    seen_keys[1].update(doi_hash[new & (doi_hash != 0)].tolist())
+    return df
+
+
+def _append_csv(df, path, started):
+    df.to_csv(path, mode="a" if path in started else "w", header=path not in started, index=False)
+    started.add(path)
+
+
+def screen_exports(paths, rules, output_path=OUTPUT_PATH, bib_paths=BIB_PATHS):
+    """Screen every export, writing included and excluded records. Returns reason counts."""
+    bib_keys = bibliography_keys(bib_paths)
+    seen_keys = (set(), set())
+    print(f"✓ Loaded {len(bib_keys[0])} titles and {len(bib_keys[1])} DOIs from the bibliography")
+
+    root, ext = os.path.splitext(output_path)
+    excluded_path = f"{root}_excluded{ext}"
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+    counts = {}
+    started = set()
+    for path in paths:
+        reader = READERS.get(os.path.splitext(path)[1].lower())
+        if reader is None:
+            print(f"⚠ Skipping unsupported export: {path}")
+            continue
+        for chunk in reader(path):
+            screened = screen_chunk(chunk, rules, bib_keys, seen_keys)
+            included = screened["reason"] == ""
+            for reason, count in screened["reason"].replace("", "included").value_counts().items():
+                counts[reason] = counts.get(reason, 0) + int(count)
+            _append_csv(screened[included].drop(columns="reason"), output_path, started)
+            _append_csv(screened[~included], excluded_path, started)
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen search-result exports")
+    parser.add_argument("exports", nargs="+", help="CSV, RIS or BibTeX export files (globs allowed)")
+    parser.add_argument("--rules", help="JSON file overriding the default screening rules")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    rules = dict(DEFAULT_RULES)
+    if args.rules:
+        with open(args.rules, "r", encoding="utf-8") as f:
+            rules.update(json.load(f))
+
+    paths = sorted({path for pattern in args.exports for path in glob.glob(pattern)
+                    if os.path.isfile(path)})
+    if not paths:
+        print("✗ No export files found")
+        sys.exit(1)
+
+    counts = screen_exports(paths, rules, args.output)
+    total = sum(counts.values())
+    print(f"\nScreened {total} records from {len(paths)} files")
+    for reason, count in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f"  {reason}: {count}")
+    print(f"✓ Candidates written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
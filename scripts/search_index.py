@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Full-text search over the extracted paper texts
+
+Builds a positional inverted index (tokenized, lightly stemmed) in SQLite
+over the texts cached by extract_fulltext.py and references/Reference SLR.txt.
+Documents are re-indexed only when their text hash changes.
+
+Queries use the search-string syntax from sections/research_method.tex:
+    (steganography or watermark or "Information Hiding") and ("Large Language Model" or LLM or GPT)
+- `and`, `or`, `not` and parentheses (case-insensitive); `and` binds tighter
+  than `or`, and plain juxtaposition means `or`
+- "quoted text" (or a hyphenated term like GPT-2) is a phrase query
+Matching documents are ranked with BM25 over the query terms.
+
+Usage (from the repository root):
+    python scripts/search_index.py build
+    python scripts/search_index.py query 'arithmetic coding and "GPT-2"'
+"""
+
+import argparse
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import sys
+from array import array
+from collections import defaultdict
+
+import extract_fulltext
+import slr_data
+
+INDEX_PATH = os.path.join(slr_data.CACHE_DIR, "search.sqlite3")
+EXTRA_DOCUMENTS = ["./references/Reference SLR.txt"]
+
+# Bump when tokenization or stemming changes; forces a full rebuild
+INDEX_VERSION = "1"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an the of in on for to with by from at as is are was were be been this that "
+    "these those it its we our their which and or not".split()
+)
+
+_SUFFIXES = [
+    ("ational", "ate"), ("ization", "ize"), ("fulness", "ful"), ("iveness", "ive"),
+    ("ation", "ate"), ("ingly", ""), ("edly", ""), ("ing", ""), ("ed", ""),
+]
+
+
+def stem(token):
+    """Light suffix-stripping stemmer (plurals, -ing, -ed and common derivations)"""
+    if len(token) <= 4 or token.isdigit():
+        return token
+
+    # Plurals
+    if token.endswith("ies"):
+        token = token[:-3] + "y"
+    elif token.endswith(("sses", "xes", "ches", "shes")):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+
+    for suffix, replacement in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+            token = token[:-len(suffix)] + replacement
+            # -ed/-ing leave a doubled consonant behind (embedded -> embedd)
+            if not replacement and token[-1] == token[-2] and token[-1] not in "aeioulsz":
+                token = token[:-1]
+            break
+    return token
+
+
+def tokenize(text):
+    """Yield (position, term) pairs; stopwords consume a position but are not indexed"""
+    for position, match in enumerate(TOKEN_PATTERN.finditer(text.lower())):
+        token = match.group()
+        if token not in STOPWORDS:
+            yield position, stem(token)
+
+
+# --- Index maintenance -----------------------------------------------------
+
+def connect(path=INDEX_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    db = sqlite3.connect(path)
+    db.executescript("""
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS docs (
+            id INTEGER PRIMARY KEY, name TEXT UNIQUE, sha256 TEXT, length INTEGER);
+        CREATE TABLE IF NOT EXISTS postings (
+            term TEXT, doc_id INTEGER, tf INTEGER, positions BLOB,
+            PRIMARY KEY (term, doc_id)) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+    """)
+    row = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    if row is None or row[0] != INDEX_VERSION:
+        db.executescript("DELETE FROM postings; DELETE FROM docs;")
+        db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (INDEX_VERSION,))
+        db.commit()
+    return db
+
+
+def collect_documents():
+    """Return {document name: text} for every extracted paper and extra document"""
+    documents = {f"papers/{name}": text for name, text in extract_fulltext.load_texts().items()}
+    for path in EXTRA_DOCUMENTS:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                documents[os.path.basename(path)] = f.read()
+        except FileNotFoundError:
+            print(f"⚠ Document not found: {path}")
+    return documents
+
+
+def update_index(db, documents):
+    """Index new or changed documents and drop removed ones. Returns (added, removed)."""
+    indexed = {name: (doc_id, digest) for doc_id, name, digest
+               in db.execute("SELECT id, name, sha256 FROM docs")}
+    changed = 0
+
+    for name, text in documents.items():
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if name in indexed:
+            doc_id, old_digest = indexed[name]
+            if old_digest == digest:
+                continue
+            _delete_document(db, doc_id)
+
+        positions = defaultdict(lambda: array("I"))
+        length = 0
+        for position, term in tokenize(text):
+            positions[term].append(position)
+            length += 1
+
+        doc_id = db.execute("INSERT INTO docs (name, sha256, length) VALUES (?, ?, ?)",
+                            (name, digest, length)).lastrowid
+        db.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)",
+                       ((term, doc_id, len(pos), pos.tobytes()) for term, pos in positions.items()))
+        changed += 1
+
+    removed = [doc_id for name, (doc_id, _) in indexed.items() if name not in documents]
+    for doc_id in removed:
+        _delete_document(db, doc_id)
+
+    db.commit()
+    return changed, len(removed)
+
+
+def _delete_document(db, doc_id):
+    db.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+    db.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+
+# --- Query parsing -----------------------------------------------------------
+
+QUERY_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+
+
+class Term:
+    def __init__(self, text):
+        # Multi-token terms (e.g. GPT-2) are matched as phrases
+        self.tokens = list(tokenize(text))
+
+
+class Not:
+    def __init__(self, child):
+        self.child = child
+
+
+class Op:
+    def __init__(self, kind, children):
+        self.kind = kind
+        self.children = children
+
+
+def parse_query(query):
+    """Parse a search string into a tree of Term, Not and Op('and'/'or') nodes"""
+    tokens = []
+    for match in QUERY_TOKEN.finditer(query.strip()):
+        lparen, rparen, phrase, word = match.groups()
+        if lparen or rparen:
+            tokens.append(lparen or rparen)
+        elif phrase is not None:
+            tokens.append(("term", phrase))
+        elif word.lower() in ("and", "or", "not"):
+            tokens.append(word.lower())
+        else:
+            tokens.append(("term", word))
+
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def parse_or():
+        nonlocal pos
+        children = [parse_and()]
+        while peek() not in (None, ")"):
+            if peek() == "or":
+                pos += 1
+            children.append(parse_and())
+        return children[0] if len(children) == 1 else Op("or", children)
+
+    def parse_and():
+        nonlocal pos
+        children = [parse_unary()]
+        while peek() == "and":
+            pos += 1
+            children.append(parse_unary())
+        return children[0] if len(children) == 1 else Op("and", children)
+
+    def parse_unary():
+        nonlocal pos
+        token = peek()
+        pos += 1
+        if token == "not":
+            return Not(parse_unary())
+        if token == "(":
+            node = parse_or()
+            if peek() != ")":
+                raise ValueError("Unbalanced parentheses in query")
+            pos += 1
+            return node
+        if isinstance(token, tuple):
+            return Term(token[1])
+        if token is None:
+            # Only reached after an operator, e.g. "a and" or "not"
+            raise ValueError(f"Query ends after '{tokens[-1]}'")
+        raise ValueError(f"Unexpected '{token}' in query")
+
+    if not tokens:
+        raise ValueError("Empty query")
+    tree = parse_or()
+    if pos != len(tokens):
+        raise ValueError("Unbalanced parentheses in query")
+    return tree
+
+
+# --- Query evaluation --------------------------------------------------------
+
+class Searcher:
+    """Evaluates parsed queries against the index, loading each posting list once."""
+
+    def __init__(self, db):
+        self.db = db
+        self.postings = {}
+        self.doc_lengths = dict(db.execute("SELECT id, length FROM docs"))
+        self.names = dict(db.execute("SELECT id, name FROM docs"))
+        self.avg_length = (sum(self.doc_lengths.values()) / len(self.doc_lengths)
+                           if self.doc_lengths else 0.0)
+
+    def _postings(self, term):
+        """{doc_id: (tf, positions blob)} for a stemmed term"""
+        if term not in self.postings:
+            self.postings[term] = {
+                doc_id: (tf, blob) for doc_id, tf, blob in self.db.execute(
+                    "SELECT doc_id, tf, positions FROM postings WHERE term = ?", (term,))
+            }
+        return self.postings[term]
+
+    def _match_term(self, node):
+        if not node.tokens:
+            return set()
+        lists = [self._postings(term) for _, term in node.tokens]
+        docs = set(lists[0]).intersection(*lists[1:])
+        if len(node.tokens) == 1:
+            return docs
+
+        # Phrase: every token must appear at its offset from the first one
+        offsets = [position - node.tokens[0][0] for position, _ in node.tokens]
+        matched = set()
+        for doc_id in docs:
+            position_sets = [set(array("I", postings[doc_id][1])) for postings in lists]
+            if any(all(start + offset in positions
+                       for offset, positions in zip(offsets[1:], position_sets[1:]))
+                   for start in position_sets[0]):
+                matched.add(doc_id)
+        return matched
+
+    def match(self, node):
+        """Set of doc ids satisfying the query tree"""
+        if isinstance(node, Term):
+            return self._match_term(node)
+        if isinstance(node, Not):
+            return set(self.doc_lengths) - self.match(node.child)
+        # Terms made only of stopwords constrain nothing
+        results = [self.match(child) for child in node.children
+                   if not (isinstance(child, Term) and not child.tokens)]
+        if not results:
+            return set()
+        if node.kind == "and":
+            return set.intersection(*results)
+        return set.union(*results)
+
+    def _positive_terms(self, node, terms):
+        if isinstance(node, Term):
+            terms.update(term for _, term in node.tokens)
+        elif isinstance(node, Op):
+            for child in node.children:
+                self._positive_terms(child, terms)
+        return terms
+
+    def search(self, query, limit=10):
+        """Return [(score, document name)] for the best matching documents"""
+        tree = parse_query(query)
+        docs = self.match(tree)
+        total = len(self.doc_lengths)
+        scores = dict.fromkeys(docs, 0.0)
+
+        for term in self._positive_terms(tree, set()):
+            postings = self._postings(term)
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id in docs.intersection(postings):
+                tf = postings[doc_id][0]
+                norm = 1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / (self.avg_length or 1)
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.names[item[0]]))
+        return [(score, self.names[doc_id]) for doc_id, score in ranked[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over extracted papers")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="index new or changed documents")
+    query_parser = commands.add_parser("query", help="run a search string")
+    query_parser.add_argument("query")
+    query_parser.add_argument("-k", "--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    db = connect()
+    if args.command == "build":
+        changed, removed = update_index(db, collect_documents())
+        total = db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        print(f"✓ Indexed {changed} new or changed documents, removed {removed} ({total} total)")
+        return
+
+    try:
+        results = Searcher(db).search(args.query, args.limit)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    if not results:
+        print("No matching documents.")
+    for rank, (score, name) in enumerate(results, 1):
+        print(f"{rank:3d}. {score:7.3f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
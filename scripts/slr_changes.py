@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Change feed between revisions of the SLR-Deep data
+
+Hashes every cell and row of the sheet (vectorized with pandas' hash
+functions, after the validator's type normalization so 2020 and 2020.0 or
+"" and "N/A" are the same value), keys the rows by their # column and
+compares them with the snapshot saved on the previous run. The result is a
+compact feed:
+
+    {"added": [ids], "removed": [ids], "modified": {id: [columns]},
+     "columns_added": [...], "columns_removed": [...], ...}
+
+Snapshots and the latest feed are kept per source file in
+build/cache/slr_snapshots/. Downstream stages use changed_columns() to skip
+work the edit cannot affect; watch.py only reruns the generators that read
+a changed column.
+
+Usage (from the repository root):
+    python scripts/slr_changes.py [SLR.xlsx | "data/SLR - SLR-Deep.csv"] [--no-save]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import slr_data
+import validate_slr_data
+
+SNAPSHOT_DIR = os.path.join(slr_data.CACHE_DIR, "slr_snapshots")
+DEFAULT_SOURCE = "./SLR.xlsx"
+
+# Bump when the normalization or hashing changes so old snapshots are discarded
+SNAPSHOT_VERSION = "1"
+KEY_COLUMN = "#"
+
+
+def snapshot_paths(source_path):
+    """(snapshot, feed) paths for a source file"""
+    base = os.path.join(SNAPSHOT_DIR, os.path.basename(source_path))
+    return base + ".json", base + ".changes.json"
+
+
+def cell_hashes(df):
+    """
+    (cells, rows, counts): per-cell uint64 hashes (papers x columns) and
+    per-row hashes, indexed by the integer #, and the number of rows left
+    out for a missing or repeated #
+    """
+    df = validate_slr_data.typed_frame(df)
+    ids = df[KEY_COLUMN]
+    keyed = df[ids.notna()]
+    # The first occurrence of a duplicated # wins
+    keyed = keyed[~keyed[KEY_COLUMN].duplicated()]
+    text = keyed.astype("string").fillna("")
+    cells = pd.DataFrame(
+        {column: pd.util.hash_pandas_object(text[column], index=False).to_numpy() for column in text.columns},
+        index=keyed[KEY_COLUMN].astype("int64").to_numpy(),
+    )
+    rows = pd.util.hash_pandas_object(cells, index=False)
+    counts = {"unkeyed_rows": len(df) - int(ids.notna().sum()),
+              "duplicate_ids": int(ids.notna().sum()) - len(keyed)}
+    return cells, rows, counts
+
+
+def load_snapshot(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    cells = pd.DataFrame(np.array(snapshot["cells"], dtype=np.uint64).reshape(-1, len(snapshot["columns"])),
+                         index=np.array(snapshot["ids"], dtype=np.int64), columns=snapshot["columns"])
+    rows = pd.Series(np.array(snapshot["rows"], dtype=np.uint64), index=cells.index)
+    return {"sha256": snapshot["sha256"], "cells": cells, "rows": rows, "counts": snapshot["counts"]}
+
+
+def save_snapshot(path, source_hash, cells, rows, counts):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": SNAPSHOT_VERSION,
+            "sha256": source_hash,
+            "counts": counts,
+            "columns": list(cells.columns),
+            "ids": cells.index.tolist(),
+            "rows": rows.tolist(),
+            "cells": cells.to_numpy().tolist(),
+        }, f, separators=(",", ":"))
+
+
+def diff(previous, cells, rows):
+    """Feed entries between a previous snapshot (or None) and the current hashes"""
+    if previous is None:
+        return {"first_snapshot": True, "added": cells.index.tolist(), "removed": [], "modified": {},
+                "columns_added": list(cells.columns), "columns_removed": []}
+
+    old_cells, old_rows = previous["cells"], previous["rows"]
+    shared_columns = [column for column in cells.columns if column in old_cells.columns]
+    common = cells.index.intersection(old_cells.index)
+
+    if list(cells.columns) == list(old_cells.columns):
+        # Same layout: row hashes rule out unchanged rows before comparing cells
+        common = common[rows.loc[common].to_numpy() != old_rows.loc[common].to_numpy()]
+    changed = cells.loc[common, shared_columns].to_numpy() != old_cells.loc[common, shared_columns].to_numpy()
+    modified = {}
+    for row_id, mask in zip(common, changed):
+        if mask.any():
+            modified[str(row_id)] = [column for column, flag in zip(shared_columns, mask) if flag]
+
+    return {
+        "first_snapshot": False,
+        "added": cells.index.difference(old_cells.index).tolist(),
+        "removed": old_cells.index.difference(cells.index).tolist(),
+        "modified": modified,
+        "columns_added": [column for column in cells.columns if column not in old_cells.columns],
+        "columns_removed": [column for column in old_cells.columns if column not in cells.columns],
+    }
+
+
+def detect_changes(df, source_path, save=True):
+    """
+    Compare `df` (loaded from source_path) with the last snapshot of that
+    file and return the change feed. With `save`, the current hashes become
+    the new snapshot and the feed is written next to it.
+    """
+    snapshot_path, feed_path = snapshot_paths(source_path)
+    source_hash = slr_data.file_sha256(source_path)
+    previous = load_snapshot(snapshot_path)
+
+    if previous is not None and previous["sha256"] == source_hash:
+        # Same bytes as last time: nothing to hash or compare
+        feed = {"first_snapshot": False, "added": [], "removed": [], "modified": {},
+                "columns_added": [], "columns_removed": [], **previous["counts"]}
+    else:
+        cells, rows, counts = cell_hashes(df)
+        feed = {**diff(previous, cells, rows), **counts}
+        if save:
+            save_snapshot(snapshot_path, source_hash, cells, rows, counts)
+
+    feed = {"source": source_path, "sha256": source_hash,
+            "previous_sha256": previous["sha256"] if previous else None, **feed}
+    if save:
+        with open(feed_path, "w", encoding="utf-8") as f:
+            json.dump(feed, f, indent=1)
+    return feed
+
+
+def has_changes(feed):
+    return bool(feed["added"] or feed["removed"] or feed["modified"]
+                or feed["columns_added"] or feed["columns_removed"])
+
+
+def changed_columns(feed):
+    """
+    Columns whose values changed, or None when rows were added or removed
+    (which can affect any output)
+    """
+    if feed["added"] or feed["removed"]:
+        return None
+    columns = set(feed["columns_added"]) | set(feed["columns_removed"])
+    for row_columns in feed["modified"].values():
+        columns.update(row_columns)
+    return columns
+
+
+def print_summary(feed):
+    if feed["first_snapshot"]:
+        print(f"✓ First snapshot of {feed['source']}: {len(feed['added'])} papers")
+    elif not has_changes(feed):
+        print(f"✓ No changes in {feed['source']}")
+    else:
+        print(f"✓ {feed['source']}: {len(feed['added'])} added, {len(feed['removed'])} removed, "
+              f"{len(feed['modified'])} modified papers")
+        for row_id, columns in sorted(feed["modified"].items(), key=lambda item: int(item[0])):
+            print(f"  #{row_id}: {', '.join(columns)}")
+        if feed["columns_added"] or feed["columns_removed"]:
+            print(f"  columns added: {feed['columns_added']}, removed: {feed['columns_removed']}")
+    if feed.get("unkeyed_rows") or feed.get("duplicate_ids"):
+        print(f"⚠ {feed['unkeyed_rows']} rows without # and {feed['duplicate_ids']} duplicate # values were not tracked")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show what changed in the SLR data since the last run")
+    parser.add_argument("source", nargs="?", default=DEFAULT_SOURCE)
+    parser.add_argument("--no-save", action="store_true", help="compare without updating the snapshot")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.source):
+        print(f"✗ File not found: {args.source}")
+        sys.exit(1)
+    if args.source.lower().endswith(".csv"):
+        df = slr_data.load_csv(args.source, None)
+    else:
+        df = slr_data.load_sheet(args.source, None)
+    print_summary(detect_changes(df, args.source, save=not args.no_save))
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Shared loader for the SLR-Deep data (SLR.xlsx sheet or its CSV export)
+
+Each generator only needs a handful of the sheet's columns, so the loaders
+project the requested columns at read time and store text as Arrow-backed
+strings (or categoricals for low-cardinality labels). Files larger than
+LARGE_FILE_BYTES are read incrementally: CSV in chunks, XLSX through
+openpyxl's read-only streaming mode. An optional row filter is applied per
+chunk, so peak memory follows the rows actually kept rather than the file.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+SHEET_NAME = "SLR-Deep"
+
+# Persistent caches shared by the scripts (run from the repository root)
+CACHE_DIR = "./build/cache"
+
+# Inputs above this size are streamed instead of read in one go
+LARGE_FILE_BYTES = 32 * 1024 * 1024
+CSV_CHUNK_ROWS = 50_000
+
+
+def _string_dtype():
+    """Arrow-backed string dtype with NaN for missing values, if pyarrow is available"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return object
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)  # pandas >= 2.3
+    except TypeError:
+        return "string[pyarrow_numpy]"  # pandas 2.1 / 2.2
+
+
+STRING_DTYPE = _string_dtype()
+
+
+def file_sha256(path):
+    """Hash a file in blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def apply_dtypes(df, categorical=()):
+    """Convert text columns to STRING_DTYPE and the `categorical` ones to category"""
+    for col in df.columns:
+        if col in categorical:
+            df[col] = df[col].astype("category")
+        elif pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].astype(STRING_DTYPE)
+    return df
+
+
+def _filter(df, row_filter):
+    return df if row_filter is None else df[row_filter(df)]
+
+
+def load_csv(path, columns, row_filter=None, categorical=(), chunksize=None):
+    """
+    Load only `columns` from a CSV export of the sheet.
+
+    `row_filter` takes a DataFrame and returns a boolean mask of rows to keep.
+    Large files (or an explicit `chunksize`) are read chunk by chunk.
+    """
+    if chunksize is None and os.path.getsize(path) > LARGE_FILE_BYTES:
+        chunksize = CSV_CHUNK_ROWS
+
+    if chunksize is None:
+        df = _filter(pd.read_csv(path, usecols=columns), row_filter)
+    else:
+        kept = [apply_dtypes(_filter(chunk, row_filter), categorical)
+                for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize)]
+        df = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame(columns=columns)
+
+    # Keep the requested column order (usecols preserves file order)
+    if columns is not None:
+        df = df[list(columns)]
+    return apply_dtypes(df, categorical)
+
+
+def load_sheet(path, columns, sheet_name=SHEET_NAME, row_filter=None, categorical=()):
+    """
+    Load only `columns` from an Excel sheet.
+
+    `columns` may be header names or 0-based column positions, as with
+    pandas' usecols, or None for every column. Large workbooks are
+    streamed with openpyxl.
+    """
+    if os.path.getsize(path) > LARGE_FILE_BYTES:
+        df = _stream_sheet(path, columns, sheet_name)
+    else:
+        df = pd.read_excel(path, sheet_name=sheet_name, usecols=columns)
+    return apply_dtypes(_filter(df, row_filter), categorical)
+
+
+def _stream_sheet(path, columns, sheet_name):
+    """Read the projected columns of a sheet row by row in read-only mode"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        if columns is None:
+            positions = list(range(len(header)))
+        else:
+            positions = sorted(col if isinstance(col, int) else header.index(col)
+                               for col in columns)
+        records = []
+        for row in rows:
+            values = tuple(row[pos] if pos < len(row) else None for pos in positions)
+            if any(value is not None for value in values):
+                records.append(values)
+    finally:
+        workbook.close()
+
+    return pd.DataFrame.from_records(records, columns=[header[pos] for pos in positions])
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Category suggestions for the SLR-Deep sheet and screened candidates
+
+Builds a sparse TF-IDF matrix (SciPy CSR, the tokenizer and stemmer of
+search_index.py) over each paper's title and method text, then:
+- suggests a Category from the k nearest hand-categorized papers (cosine
+  similarity), with the similarity-weighted vote share as confidence
+- groups all papers with spherical k-means and names each cluster by its
+  top terms and most common existing Category, so papers with no close
+  neighbour still get a proposal
+
+Hand-assigned categories (shared by two or more papers) that disagree with
+their neighbours are listed as well, which catches inconsistent labels.
+Runs on CPU in seconds with NumPy and SciPy only.
+
+Usage (from the repository root):
+    python scripts/suggest_categories.py [--candidates build/screened_candidates.csv] [--clusters K]
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+import search_index
+import slr_data
+
+EXCEL_PATH = "./SLR.xlsx"
+OUTPUT_PATH = "./build/category_suggestions.csv"
+
+# Sheet columns describing a paper's method
+TEXT_COLUMNS = ["title", "pipline method used", "context usage in method detail text"]
+# Candidate export columns (screen_search_results.py output)
+CANDIDATE_COLUMNS = ["title", "abstract", "keywords"]
+
+NEIGHBOURS = 5
+MIN_DOCUMENT_FREQUENCY = 2
+# Below this neighbour similarity the cluster proposal is used instead
+MIN_SIMILARITY = 0.1
+KMEANS_ITERATIONS = 50
+BLOCK_ROWS = 4096
+SEED = 0
+
+
+def tfidf_matrix(texts, min_df=MIN_DOCUMENT_FREQUENCY):
+    """
+    L2-normalized TF-IDF rows (sublinear tf, smoothed idf) for `texts`.
+
+    Returns (csr matrix, vocabulary list).
+    """
+    rows, cols, counts, vocabulary = [], [], [], {}
+    for row, text in enumerate(texts):
+        for term, count in Counter(term for _, term in search_index.tokenize(text)).items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+
+    tf = sparse.csr_matrix((np.asarray(counts, dtype=np.float64), (rows, cols)),
+                           shape=(len(texts), len(vocabulary)))
+    df = np.bincount(tf.indices, minlength=tf.shape[1])
+    keep = np.flatnonzero(df >= min(min_df, len(texts)))
+    tf, df = tf[:, keep], df[keep]
+    terms = np.array(list(vocabulary))[keep].tolist()
+
+    tf.data = 1 + np.log(tf.data)
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1
+    matrix = tf @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1))).ravel()
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ matrix), terms
+
+
+def nearest_neighbours(matrix, reference, k=NEIGHBOURS, exclude_self=False):
+    """
+    Indices and cosine similarities of the k most similar reference rows for
+    each row, computed in blocks of BLOCK_ROWS to bound memory
+    """
+    k = min(k, reference.shape[0])
+    indices, similarities = [], []
+    for start in range(0, matrix.shape[0], BLOCK_ROWS):
+        block = (matrix[start:start + BLOCK_ROWS] @ reference.T).toarray()
+        if exclude_self:
+            rows = np.arange(block.shape[0])
+            block[rows, rows + start] = -1
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_similarities = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-top_similarities, axis=1)
+        indices.append(np.take_along_axis(top, order, axis=1))
+        similarities.append(np.take_along_axis(top_similarities, order, axis=1))
+    return np.vstack(indices), np.vstack(similarities)
+
+
+def vote(neighbours, similarities, labels):
+    """Similarity-weighted category vote: (category, share of the total weight, best similarity)"""
+    suggestions = []
+    for indices, weights in zip(neighbours, similarities):
+        scores = Counter()
+        for index, weight in zip(indices, weights):
+            if weight > 0:
+                scores[labels[index]] += weight
+        if not scores:
+            suggestions.append(("", 0.0, 0.0))
+            continue
+        category, score = scores.most_common(1)[0]
+        suggestions.append((category, score / sum(scores.values()), float(weights[0])))
+    return suggestions
+
+
+def spherical_kmeans(matrix, k, iterations=KMEANS_ITERATIONS, seed=SEED):
+    """Cluster L2-normalized rows by cosine similarity (k-means++ seeding). Returns (labels, centroids)."""
+    rng = np.random.default_rng(seed)
+    n = matrix.shape[0]
+    centroids = [matrix[rng.integers(n)].toarray().ravel()]
+    for _ in range(1, k):
+        distance = np.clip(1 - (matrix @ np.array(centroids).T).max(axis=1), 0, None)
+        total = distance.sum()
+        index = rng.choice(n, p=distance / total) if total > 0 else rng.integers(n)
+        centroids.append(matrix[index].toarray().ravel())
+    centroids = np.array(centroids)
+
+    labels = np.full(n, -1)
+    for _ in range(iterations):
+        new_labels = np.asarray(matrix @ centroids.T).argmax(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for cluster in range(k):
+            members = labels == cluster
+            if members.any():
+                centroid = np.asarray(matrix[members].sum(axis=0)).ravel()
+                centroids[cluster] = centroid / (np.linalg.norm(centroid) or 1)
+    return labels, centroids
+
+
+def describe_clusters(labels, centroids, terms, categories, top_terms=4):
+    """Name each cluster by its heaviest terms and its most common existing category"""
+    names = {}
+    for cluster, centroid in enumerate(centroids):
+        words = [terms[i] for i in np.argsort(-centroid)[:top_terms] if centroid[i] > 0]
+        assigned = Counter(category for category, label in zip(categories, labels)
+                           if label == cluster and category)
+        names[cluster] = (assigned.most_common(1)[0][0] if assigned else "", " ".join(words))
+    return names
+
+
+def load_papers(excel_path=EXCEL_PATH, candidates_path=None):
+    """One frame of sheet papers and optional screened candidates: source, #, title, Category, text"""
+    sheet = slr_data.load_sheet(excel_path, ["#", "Category"] + TEXT_COLUMNS)
+    sheet = sheet[sheet["title"].notna()]
+    papers = pd.DataFrame({
+        "source": "sheet",
+        "#": sheet["#"],
+        "title": sheet["title"],
+        "Category": sheet["Category"].fillna("").astype(str).str.strip(),
+        "text": sheet[TEXT_COLUMNS].fillna("").astype(str).agg(" ".join, axis=1),
+    })
+    if candidates_path:
+        candidates = slr_data.load_csv(candidates_path, CANDIDATE_COLUMNS)
+        papers = pd.concat([papers, pd.DataFrame({
+            "source": "candidate",
+            "#": None,
+            "title": candidates["title"],
+            "Category": "",
+            "text": candidates[CANDIDATE_COLUMNS].fillna("").astype(str).agg(" ".join, axis=1),
+        })], ignore_index=True)
+    return papers.reset_index(drop=True)
+
+
+def suggest_categories(papers, clusters=None):
+    """Add suggested_category, confidence, similarity, cluster and cluster_terms to `papers`"""
+    matrix, terms = tfidf_matrix(papers["text"].tolist())
+    categories = papers["Category"].tolist()
+    labelled = np.flatnonzero(papers["Category"] != "")
+
+    papers = papers.copy()
+    papers["suggested_category"], papers["confidence"], papers["similarity"] = "", 0.0, 0.0
+    if len(labelled):
+        reference = matrix[labelled]
+        labels = [categories[i] for i in labelled]
+        # Labelled papers are compared with the other labelled papers only
+        unlabelled = np.flatnonzero(papers["Category"] == "")
+        for rows, exclude_self in ((labelled, True), (unlabelled, False)):
+            if not len(rows) or (exclude_self and len(labelled) < 2):
+                continue
+            neighbours, similarities = nearest_neighbours(matrix[rows], reference, exclude_self=exclude_self)
+            suggestions = vote(neighbours, similarities, labels)
+            papers.loc[rows, ["suggested_category", "confidence", "similarity"]] = suggestions
+
+    k = clusters or max(2, min(len(papers), len(set(categories) - {""}) or int(np.sqrt(len(papers) / 2))))
+    cluster_labels, centroids = spherical_kmeans(matrix, min(k, len(papers)))
+    names = describe_clusters(cluster_labels, centroids, terms, categories)
+    papers["cluster"] = cluster_labels
+    papers["cluster_terms"] = [names[label][1] for label in cluster_labels]
+
+    # No close categorized neighbour: fall back to the cluster's category
+    weak = papers["similarity"] < MIN_SIMILARITY
+    papers.loc[weak, "suggested_category"] = [names[label][0] for label in cluster_labels[weak.to_numpy()]]
+    papers.loc[weak, "confidence"] = 0.0
+    return papers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suggest paper categories from title and method text")
+    parser.add_argument("--candidates", help="screened candidates CSV to categorize as well")
+    parser.add_argument("--clusters", type=int, help="number of k-means clusters")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    papers = load_papers(EXCEL_PATH, args.candidates)
+    if len(papers) < 2:
+        print("✗ Not enough papers to compare")
+        sys.exit(1)
+    print(f"✓ Loaded {len(papers)} papers")
+
+    result = suggest_categories(papers, args.clusters)
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    result.drop(columns="text").to_csv(args.output, index=False)
+
+    # A paper alone in its category has no neighbour that could agree
+    sizes = result["Category"].map(result["Category"].value_counts())
+    hand = result[(result["Category"] != "") & (sizes > 1)]
+    disagreements = hand[(hand["suggested_category"] != "") & (hand["suggested_category"] != hand["Category"])]
+    print(f"✓ Neighbours agree with {len(hand) - len(disagreements)}/{len(hand)} hand-assigned categories")
+    for _, row in disagreements.iterrows():
+        print(f"  #{row['#']}: {row['Category']} → {row['suggested_category']} "
+              f"({row['confidence']:.2f}) {row['title'][:60]}")
+
+    open_rows = result[result["Category"] == ""]
+    print(f"\nSuggestions for {len(open_rows)} uncategorized papers:")
+    for _, row in open_rows.head(20).iterrows():
+        label = row["suggested_category"] or f"new cluster: {row['cluster_terms']}"
+        print(f"  {label} ({row['confidence']:.2f}) {row['title'][:60]}")
+    print(f"✓ Suggestions written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
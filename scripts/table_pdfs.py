@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Standalone, precompiled PDFs of the generated tables
+
+Each generated longtable is written to sections/tables/<name>.tex. With
+--precompile, generate_tables.py also compiles it once into
+build/tables/<name>-<hash>.pdf, where the hash covers the table source, the
+standalone preamble and the citation numbers taken from the draft's .aux
+file, so a PDF is only rebuilt when the table would look different.
+
+sections/generated_tables.tex includes every table through
+\\generatedtable{source}{pdf}{pages}. draft.tex defines that macro: with
+\\precompiledtablestrue (drafts) it places the PDF pages, so pdflatex no
+longer typesets the longtable on every pass; with \\precompiledtablesfalse
+(camera-ready), or when the PDF does not exist, it inputs the longtable.
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+
+TABLES_TEX_DIR = "./sections/tables"
+PDF_DIR = "./build/tables"
+# latexmk writes the .aux to build/, a plain pdflatex run next to draft.tex
+AUX_PATHS = ["./build/draft.aux", "./draft.aux"]
+
+# Bump when the standalone document setup changes
+STANDALONE_VERSION = "1"
+PREAMBLE = r"""\documentclass{article}
+\usepackage[landscape,margin=0.5in]{geometry}
+\usepackage{longtable}
+\usepackage{array}
+\usepackage{amsmath}
+\usepackage{textcomp}
+\usepackage[numbers,sort&compress]{natbib}
+\pagestyle{empty}
+"""
+
+PDFLATEX_PASSES = 2
+_PAGES_PATTERN = re.compile(r"Output written on .*?\((\d+) pages?")
+
+
+def cited_keys(latex):
+    return {key.strip() for keys in re.findall(r"\\cite[a-zA-Z]*\{([^}]*)\}", latex) for key in keys.split(",")}
+
+
+def bibcite_lines(keys):
+    """The draft's \\bibcite definitions for `keys`, so citations keep their numbers"""
+    for path in AUX_PATHS:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                lines = [line.strip() for line in f if line.startswith("\\bibcite{")]
+        except FileNotFoundError:
+            continue
+        return [line for line in lines if line[len("\\bibcite{"):].split("}", 1)[0] in keys]
+    return []
+
+
+def standalone_source(latex, bibcites):
+    return (PREAMBLE + "\\makeatletter\n" + "\n".join(bibcites) + "\n\\makeatother\n"
+            "\\begin{document}\n" + latex + "\\end{document}\n")
+
+
+def standalone_build(name, latex):
+    """(standalone source, pdf path, sidecar json path) for one table"""
+    bibcites = bibcite_lines(cited_keys(latex))
+    source = standalone_source(latex, bibcites)
+    digest = hashlib.sha1((STANDALONE_VERSION + source).encode("utf-8")).hexdigest()[:12]
+    base = os.path.join(PDF_DIR, f"{name}-{digest}")
+    return source, base + ".pdf", base + ".json"
+
+
+def built_pdf(pdf_path, meta_path):
+    """Page count of an up-to-date PDF, or None if it has not been built"""
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            pages = json.load(f)["pages"]
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+    return pages if os.path.exists(pdf_path) else None
+
+
+def compile_table(name, latex):
+    """
+    Compile one table unless a PDF for this exact input exists.
+    Returns (pdf path, page count), or (None, 0) if it could not be built.
+    """
+    source, pdf_path, meta_path = standalone_build(name, latex)
+    pages = built_pdf(pdf_path, meta_path)
+    if pages is not None:
+        return pdf_path, pages
+    if cited_keys(latex) and "\\bibcite" not in source:
+        print(f"⚠ No draft .aux found; citations in {name} will show as [?]")
+
+    os.makedirs(PDF_DIR, exist_ok=True)
+    tex_path = pdf_path[:-len(".pdf")] + ".tex"
+    with open(tex_path, "w", encoding="utf-8") as f:
+        f.write(source)
+
+    for _ in range(PDFLATEX_PASSES):
+        try:
+            result = subprocess.run(
+                ["pdflatex", "-interaction=nonstopmode", "-halt-on-error",
+                 "-output-directory", PDF_DIR, tex_path],
+                capture_output=True, text=True, errors="replace")
+        except FileNotFoundError:
+            print("⚠ pdflatex not found; tables stay inline")
+            return None, 0
+        if result.returncode != 0:
+            print(f"✗ Could not compile {tex_path}; see {tex_path[:-4]}.log")
+            return None, 0
+        match = _PAGES_PATTERN.search(result.stdout)
+        pages = int(match.group(1)) if match else 0
+        # Fixed p{} widths normally settle in one pass
+        if "Rerun" not in result.stdout:
+            break
+
+    # Older builds of this table are no longer referenced
+    prefix = os.path.basename(pdf_path)[:-len(".pdf")]
+    for stale in os.listdir(PDF_DIR):
+        if stale.startswith(f"{name}-") and not stale.startswith(prefix + "."):
+            os.remove(os.path.join(PDF_DIR, stale))
+
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"pages": pages}, f)
+    print(f"✓ Precompiled {name} ({pages} pages): {pdf_path}")
+    return pdf_path, pages
+
+
+def _tex_path(path):
+    """Path as written in LaTeX: relative to the repository root, forward slashes"""
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def write_table_source(name, latex):
+    """Write sections/tables/<name>.tex if its content changed. Returns its path."""
+    path = os.path.join(TABLES_TEX_DIR, f"{name}.tex")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == latex:
+                return path
+    except FileNotFoundError:
+        pass
+    os.makedirs(TABLES_TEX_DIR, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(latex)
+    return path
+
+
+def include_line(name, latex, precompile=False):
+    """
+    The \\generatedtable line for one table. Writes the table source and,
+    when precompiling, its PDF; otherwise a PDF is only used if one already
+    exists for this exact source.
+    """
+    source_path = write_table_source(name, latex)
+    if precompile:
+        pdf_path, pages = compile_table(name, latex)
+    else:
+        _, pdf_path, meta_path = standalone_build(name, latex)
+        pages = built_pdf(pdf_path, meta_path)
+        if pages is None:
+            pdf_path, pages = None, 0
+    pdf = _tex_path(pdf_path) if pdf_path else ""
+    return f"\\generatedtable{{{_tex_path(source_path)}}}{{{pdf}}}{{{pages}}}\n"
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Data-quality validation for the SLR-Deep sheet
+
+Checks the whole sheet column by column in one vectorized pass:
+- `#` is present, integral and unique
+- every row has a title
+- `Year` is a plausible publication year
+- placeholder cells such as "[Not specified]"
+- label columns (Category, context aware, ...) with spellings that differ
+  only in case or spacing, and values outside the expected vocabulary
+
+The report is cached in build/cache/slr_validation.json keyed by the SHA-256 of
+the input and the validated columns, so an unchanged sheet is not re-validated. typed_frame() gives
+generators the validated columns with proper dtypes (`#` and `Year` as
+nullable integers, placeholders as missing), so they do not need per-cell
+conversions.
+"""
+
+import datetime
+import json
+import os
+import sys
+
+import pandas as pd
+
+import slr_data
+
+EXCEL_PATH = "./SLR.xlsx"
+REPORT_PATH = os.path.join(slr_data.CACHE_DIR, "slr_validation.json")
+
+# Bump when checks change so cached reports are discarded
+VALIDATOR_VERSION = "1"
+
+REQUIRED_COLUMNS = ["#", "title"]
+PLACEHOLDERS = ["[Not specified]", "N/A", "n/a", "-", "?"]
+MIN_YEAR = 1990
+
+# Columns holding labels, checked for case/spacing variants
+LABEL_COLUMNS = ["Type", "Category", "context aware", "categ context",
+                 "representation context", "code available"]
+
+# Expected vocabulary (casefolded) of the leading label, i.e. before any ';'
+VOCABULARIES = {
+    "Type": ["steganography", "watermarking"],
+    "context aware": ["explicit", "implicit", "non-explicit", "not explicit", "no", "yes"],
+}
+
+
+def _ids(df, mask):
+    """Row identifiers for a mask: the # value when present, else the sheet row"""
+    rows = df.index[mask]
+    ids = pd.to_numeric(df.loc[mask, "#"], errors="coerce") if "#" in df.columns else [None] * len(rows)
+    return [f"{value:g}" if pd.notna(value) else f"row {row + 2}" for row, value in zip(rows, ids)]
+
+
+def _issue(severity, check, column, detail, rows=()):
+    return {"severity": severity, "check": check, "column": column, "detail": detail, "rows": list(rows)}
+
+
+def validate(df):
+    """Return the list of issues found in the sheet"""
+    issues = []
+
+    for column in REQUIRED_COLUMNS:
+        if column not in df.columns:
+            issues.append(_issue("error", "missing column", column, "required column is missing"))
+    if any(issue["check"] == "missing column" for issue in issues):
+        return issues
+
+    text = df.select_dtypes(exclude="number").astype("string").apply(lambda col: col.str.strip())
+
+    # Placeholder cells, all text columns at once
+    placeholder = text.isin(PLACEHOLDERS)
+    for column in placeholder.columns[placeholder.any()]:
+        issues.append(_issue("warning", "placeholder", column,
+                             "placeholder value instead of data", _ids(df, placeholder[column])))
+
+    # The # column must be integral and unique
+    ids = pd.to_numeric(df["#"], errors="coerce")
+    bad_ids = df["#"].notna() & (ids.isna() | (ids % 1 != 0))
+    if bad_ids.any():
+        issues.append(_issue("error", "non-integer id", "#", "value is not a whole number",
+                             [f"row {row + 2}" for row in df.index[bad_ids]]))
+    if df["#"].isna().any():
+        issues.append(_issue("warning", "missing id", "#", "row has no # value",
+                             [f"row {row + 2}" for row in df.index[df["#"].isna()]]))
+    duplicated = ids.notna() & ids.duplicated(keep=False)
+    if duplicated.any():
+        issues.append(_issue("error", "duplicate id", "#", "same # used by several rows",
+                             _ids(df, duplicated)))
+
+    title = text["title"] if "title" in text.columns else df["title"].astype("string")
+    missing_title = title.isna() | (title == "") | title.isin(PLACEHOLDERS)
+    if missing_title.any():
+        issues.append(_issue("error", "missing title", "title", "row has no title and is skipped",
+                             _ids(df, missing_title)))
+
+    if "Year" in df.columns:
+        year = pd.to_numeric(df["Year"], errors="coerce")
+        max_year = datetime.date.today().year + 1
+        bad_year = df["Year"].notna() & (year.isna() | (year % 1 != 0) | (year < MIN_YEAR) | (year > max_year))
+        if bad_year.any():
+            issues.append(_issue("warning", "invalid year", "Year",
+                                 f"not a year between {MIN_YEAR} and {max_year}", _ids(df, bad_year)))
+
+    for column in LABEL_COLUMNS:
+        if column not in text.columns:
+            continue
+        values = text[column].dropna()
+        values = values[~values.isin(PLACEHOLDERS)]
+        folded = values.str.replace(r"\s+", " ", regex=True).str.casefold()
+
+        spellings = values.groupby(folded).unique()
+        for variants in spellings[spellings.map(len) > 1]:
+            issues.append(_issue("warning", "inconsistent spelling", column,
+                                 "variants of the same label: " + ", ".join(sorted(variants)),
+                                 _ids(df, text[column].isin(variants))))
+
+        if column in VOCABULARIES:
+            head = folded.str.split(";").str[0].str.strip()
+            unknown = ~head.isin(VOCABULARIES[column])
+            if unknown.any():
+                labels = sorted(values[unknown].unique())
+                issues.append(_issue("warning", "unexpected value", column,
+                                     "outside the expected vocabulary: " + ", ".join(labels),
+                                     _ids(df, df.index.isin(values.index[unknown]))))
+
+    return issues
+
+
+def typed_frame(df):
+    """Validated dtypes: # and Year as nullable integers, trimmed text, placeholders missing"""
+    df = df.copy()
+    for column in df.columns:
+        if column in ("#", "Year"):
+            numbers = pd.to_numeric(df[column], errors="coerce")
+            df[column] = numbers.where(numbers % 1 == 0).astype("Int64")
+        elif not pd.api.types.is_numeric_dtype(df[column]) and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            values = df[column].astype(slr_data.STRING_DTYPE).str.strip()
+            df[column] = values.mask(values.isin(PLACEHOLDERS))
+    return df
+
+
+def load_report(source_hash, columns, path=REPORT_PATH):
+    """Cached issues for this input and column set, or None if the cache is stale"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            reports = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    report = reports.get(",".join(columns))
+    if not report or report.get("source_sha256") != source_hash or report.get("version") != VALIDATOR_VERSION:
+        return None
+    return report["issues"]
+
+
+def save_report(source_hash, columns, issues, path=REPORT_PATH):
+    """Store the issues under the validated column set, keeping reports for other projections"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            reports = json.load(f)
+    except (FileNotFoundError, ValueError):
+        reports = {}
+    reports[",".join(columns)] = {"version": VALIDATOR_VERSION, "source_sha256": source_hash, "issues": issues}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(reports, f, indent=2, ensure_ascii=False)
+
+
+def validate_file(df, path=EXCEL_PATH):
+    """Validate `df` (loaded from `path`), reusing the cached report when the file is unchanged"""
+    source_hash = slr_data.file_sha256(path)
+    columns = [str(column) for column in df.columns]
+    issues = load_report(source_hash, columns)
+    if issues is None:
+        issues = validate(df)
+        save_report(source_hash, columns, issues)
+    return issues
+
+
+def print_summary(issues):
+    errors = sum(1 for issue in issues if issue["severity"] == "error")
+    if not issues:
+        print("✓ SLR data passed validation")
+        return
+    print(f"⚠ SLR data validation: {errors} errors, {len(issues) - errors} warnings (see {REPORT_PATH})")
+
+
+if __name__ == "__main__":
+    df = slr_data.load_sheet(EXCEL_PATH, None)
+    issues = validate(df)
+    save_report(slr_data.file_sha256(EXCEL_PATH), [str(column) for column in df.columns], issues)
+
+    print("=" * 60)
+    print("SLR-Deep Data Validation")
+    print("=" * 60)
+    for issue in issues:
+        marker = "✗" if issue["severity"] == "error" else "⚠"
+        rows = ", ".join(issue["rows"][:10]) + (" ..." if len(issue["rows"]) > 10 else "")
+        print(f"{marker} [{issue['column']}] {issue['check']}: {issue['detail']}")
+        if rows:
+            print(f"    rows: {rows}")
+    print()
+    print_summary(issues)
+    sys.exit(1 if any(issue["severity"] == "error" for issue in issues) else 0)
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+Native SVG/PDF rendering of the category sunburst and treemap
+
+Lays out the Category -> paper hierarchy itself and writes SVG or PDF
+directly, without plotly's Kaleido/Chromium export, so it renders in
+milliseconds and needs nothing outside the standard library. Colors and
+title shortening come from generate_sunburst (color_palette, display_title).
+
+A hierarchy is a list of (category, color, [paper labels]); every paper
+counts as one unit, like the plotly charts with branchvalues="total".
+Shapes are laid out in a y-down coordinate system (as in SVG); the PDF
+writer flips it. Text uses Helvetica, one of the PDF standard fonts, so
+nothing is embedded.
+"""
+
+import math
+import zlib
+from xml.sax.saxutils import escape
+
+# Helvetica advance widths (1/1000 em) for ASCII 32..126
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+DEFAULT_WIDTH = 556
+
+FONT_FAMILY = "Helvetica, Arial, sans-serif"
+TEXT_COLOR = "#000000"
+BORDER_COLOR = "#ffffff"
+# Text smaller than this is left out, as plotly hides labels that do not fit
+MIN_FONT_SIZE = 5
+CATEGORY_FONT_SIZE = 14
+TITLE_FONT_SIZE = 10
+
+
+def text_width(text, size):
+    """Width of `text` set in Helvetica at `size`"""
+    return sum(_HELVETICA_WIDTHS[ord(c) - 32] if 32 <= ord(c) <= 126 else DEFAULT_WIDTH
+               for c in text) * size / 1000
+
+
+def fit_font_size(text, size, max_width, max_height):
+    """Largest size up to `size` at which `text` fits the box, or None if below MIN_FONT_SIZE"""
+    width_at_one = text_width(text, 1) or 1
+    size = min(size, max_width / width_at_one, max_height)
+    return size if size >= MIN_FONT_SIZE else None
+
+
+def tint(color, amount):
+    """Mix a #rrggbb color with white (amount 0 = unchanged, 1 = white)"""
+    r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return "#%02x%02x%02x" % tuple(round(c + (255 - c) * amount) for c in (r, g, b))
+
+
+class Drawing:
+    """Filled paths and text recorded once and written as SVG or PDF."""
+
+    def __init__(self, width, height, background="#ffffff"):
+        self.width = width
+        self.height = height
+        self.shapes = []
+        self.rect(0, 0, width, height, background, stroke=None)
+
+    def path(self, segments, fill, stroke=BORDER_COLOR, stroke_width=1.0):
+        """segments: ('M', x, y), ('L', x, y), ('C', x1, y1, x2, y2, x, y) and ('Z',)"""
+        self.shapes.append(("path", segments, fill, stroke, stroke_width))
+
+    def rect(self, x, y, w, h, fill, stroke=BORDER_COLOR, stroke_width=1.0):
+        self.path([("M", x, y), ("L", x + w, y), ("L", x + w, y + h), ("L", x, y + h), ("Z",)],
+                  fill, stroke, stroke_width)
+
+    def text(self, x, y, text, size, color=TEXT_COLOR, angle=0.0):
+        """Text centered on (x, y), rotated clockwise by `angle` degrees"""
+        # Baseline start: half the width back along the text, and down by
+        # roughly half the cap height so the text is centered vertically
+        theta = math.radians(angle)
+        dx, dy = -text_width(text, size) / 2, 0.35 * size
+        start_x = x + dx * math.cos(theta) - dy * math.sin(theta)
+        start_y = y + dx * math.sin(theta) + dy * math.cos(theta)
+        self.shapes.append(("text", start_x, start_y, text, size, color, angle))
+
+    def svg(self):
+        parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+                 f'viewBox="0 0 {self.width} {self.height}">\n']
+        for shape in self.shapes:
+            if shape[0] == "path":
+                _, segments, fill, stroke, stroke_width = shape
+                d = " ".join(segment[0] + " ".join(f"{v:.2f}" for v in segment[1:]) for segment in segments)
+                stroke_attrs = f' stroke="{stroke}" stroke-width="{stroke_width}"' if stroke else ""
+                parts.append(f'<path d="{d}" fill="{fill}"{stroke_attrs}/>\n')
+            else:
+                _, x, y, text, size, color, angle = shape
+                transform = f' transform="rotate({angle:.2f} {x:.2f} {y:.2f})"' if angle else ""
+                parts.append(f'<text x="{x:.2f}" y="{y:.2f}" font-family="{FONT_FAMILY}" '
+                             f'font-size="{size:.2f}" fill="{color}"{transform}>{escape(text)}</text>\n')
+        parts.append("</svg>\n")
+        return "".join(parts)
+
+    def pdf(self):
+        height = self.height
+        ops = []
+        for shape in self.shapes:
+            if shape[0] == "path":
+                _, segments, fill, stroke, stroke_width = shape
+                ops.append("%.3f %.3f %.3f rg" % _rgb(fill))
+                if stroke:
+                    ops.append("%.3f %.3f %.3f RG %.2f w" % (_rgb(stroke) + (stroke_width,)))
+                for segment in segments:
+                    op, values = segment[0], segment[1:]
+                    flipped = [v if i % 2 == 0 else height - v for i, v in enumerate(values)]
+                    coordinates = " ".join(f"{v:.2f}" for v in flipped)
+                    ops.append({"M": f"{coordinates} m", "L": f"{coordinates} l",
+                                "C": f"{coordinates} c", "Z": "h"}[op])
+                ops.append("B" if stroke else "f")
+            else:
+                _, x, y, text, size, color, angle = shape
+                # Clockwise on screen is counterclockwise once y points up
+                theta = math.radians(-angle)
+                cos, sin = math.cos(theta), math.sin(theta)
+                ops.append("BT %.3f %.3f %.3f rg /F1 %.2f Tf %.4f %.4f %.4f %.4f %.2f %.2f Tm (%s) Tj ET" % (
+                    _rgb(color) + (size, cos, sin, -sin, cos, x, height - y, _pdf_string(text))))
+        content = zlib.compress("\n".join(ops).encode("latin-1"))
+
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.width} {self.height}] "
+             f"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>").encode("ascii"),
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content) + content + b"\nendstream",
+        ]
+        output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(output))
+            output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        xref = len(output)
+        output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+        return bytes(output)
+
+    def save(self, path):
+        """Write the drawing as SVG or PDF, chosen by the file extension"""
+        if path.lower().endswith(".svg"):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.svg())
+        elif path.lower().endswith(".pdf"):
+            with open(path, "wb") as f:
+                f.write(self.pdf())
+        else:
+            raise ValueError(f"Native rendering writes .svg or .pdf, not {path}")
+
+
+def _rgb(color):
+    return tuple(int(color[i:i + 2], 16) / 255 for i in (1, 3, 5))
+
+
+def _pdf_string(text):
+    """Text as a PDF literal string in WinAnsiEncoding"""
+    data = text.encode("cp1252", errors="replace").decode("latin-1")
+    return data.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+# --- Sunburst -------------------------------------------------------------------
+
+def _point(cx, cy, radius, angle):
+    """Point at `angle` radians clockwise from 12 o'clock"""
+    return cx + radius * math.sin(angle), cy - radius * math.cos(angle)
+
+
+def _arc(cx, cy, radius, start, end):
+    """Bezier segments along a circle from start to end angle (either direction)"""
+    steps = max(1, math.ceil(abs(end - start) / (math.pi / 2)))
+    step = (end - start) / steps
+    k = 4 / 3 * math.tan(step / 4) * radius
+    segments = []
+    for i in range(steps):
+        a, b = start + i * step, start + (i + 1) * step
+        (x0, y0), (x1, y1) = _point(cx, cy, radius, a), _point(cx, cy, radius, b)
+        segments.append(("C", x0 + k * math.cos(a), y0 + k * math.sin(a),
+                         x1 - k * math.cos(b), y1 - k * math.sin(b), x1, y1))
+    return segments
+
+
+def _wedge(cx, cy, inner, outer, start, end):
+    segments = [("M",) + _point(cx, cy, outer, start)] + _arc(cx, cy, outer, start, end)
+    if inner > 0:
+        segments.append(("L",) + _point(cx, cy, inner, end))
+        segments += _arc(cx, cy, inner, end, start)
+    else:
+        segments.append(("L", cx, cy))
+    segments.append(("Z",))
+    return segments
+
+
+def sunburst_drawing(hierarchy, size=800, margin=20, hole_share=0.4):
+    """Categories in the center disc, their papers in the outer ring"""
+    drawing = Drawing(size, size)
+    total = sum(len(papers) for _, _, papers in hierarchy)
+    if not total:
+        return drawing
+    cx = cy = size / 2
+    outer = size / 2 - margin
+    inner = outer * hole_share
+    unit = 2 * math.pi / total
+
+    start = 0.0
+    for category, color, papers in hierarchy:
+        if not papers:
+            continue
+        end = start + unit * len(papers)
+        drawing.path(_wedge(cx, cy, 0, inner, start, end), color)
+        for number, paper in enumerate(papers):
+            drawing.path(_wedge(cx, cy, inner, outer, start + number * unit, start + (number + 1) * unit),
+                         tint(color, 0.35))
+        start = end
+
+    # Labels after all shapes, so no wedge covers them
+    start = 0.0
+    for category, color, papers in hierarchy:
+        if not papers:
+            continue
+        end = start + unit * len(papers)
+        middle = (start + end) / 2
+        # A lone category fills the disc and is labeled at its center
+        radius = 0 if len(papers) == total else inner * 0.6
+        x, y = _point(cx, cy, radius, middle)
+        chord = inner if len(papers) == total else min(inner, 2 * radius * math.sin(min(end - start, math.pi) / 2))
+        font = fit_font_size(category, CATEGORY_FONT_SIZE, chord * 0.9, inner * 0.3)
+        if font:
+            drawing.text(x, y, category, font)
+
+        thickness = outer - inner
+        for number, paper in enumerate(papers):
+            angle = start + (number + 0.5) * unit
+            x, y = _point(cx, cy, (inner + outer) / 2, angle)
+            font = fit_font_size(paper, TITLE_FONT_SIZE, thickness * 0.9, inner * unit * 0.9)
+            if font:
+                # Radial text, flipped on the left half so it never reads upside down
+                degrees = math.degrees(angle) - 90
+                if math.pi < angle % (2 * math.pi):
+                    degrees -= 180
+                drawing.text(x, y, paper, font, angle=degrees)
+        start = end
+    return drawing
+
+
+# --- Treemap --------------------------------------------------------------------
+
+def squarify(values, x, y, w, h):
+    """
+    Squarified treemap layout (Bruls et al.): rectangles (x, y, w, h) for
+    `values`, in order, filling the box with aspect ratios close to 1
+    """
+    total = float(sum(values))
+    if not values or total <= 0 or w <= 0 or h <= 0:
+        return [(x, y, 0, 0) for _ in values]
+    areas = [value * w * h / total for value in values]
+    rects = []
+
+    def worst(row, side):
+        row_sum = sum(row)
+        return max(max(side * side * area / (row_sum * row_sum), row_sum * row_sum / (side * side * area))
+                   for area in row)
+
+    i = 0
+    while i < len(areas):
+        side = min(w, h)
+        row = [areas[i]]
+        i += 1
+        while i < len(areas) and worst(row + [areas[i]], side) <= worst(row, side):
+            row.append(areas[i])
+            i += 1
+        # Lay the row along the shorter side
+        thickness = sum(row) / side
+        offset = 0.0
+        for area in row:
+            length = area / thickness
+            if w >= h:
+                rects.append((x, y + offset, thickness, length))
+            else:
+                rects.append((x + offset, y, length, thickness))
+            offset += length
+        if w >= h:
+            x, w = x + thickness, w - thickness
+        else:
+            y, h = y + thickness, h - thickness
+    return rects
+
+
+def treemap_drawing(hierarchy, width=1000, height=700, margin=10, header=18):
+    """Category rectangles with a name header, subdivided into one tile per paper"""
+    drawing = Drawing(width, height)
+    hierarchy = [(category, color, papers) for category, color, papers in hierarchy if papers]
+    boxes = squarify([len(papers) for _, _, papers in hierarchy],
+                     margin, margin, width - 2 * margin, height - 2 * margin)
+
+    for (category, color, papers), (x, y, w, h) in zip(hierarchy, boxes):
+        drawing.rect(x, y, w, h, color, stroke_width=2)
+        band = min(header, h * 0.25)
+        font = fit_font_size(category, CATEGORY_FONT_SIZE, w * 0.95, band * 0.9)
+        if font:
+            drawing.text(x + w / 2, y + band / 2, category, font)
+        tiles = squarify([1] * len(papers), x + 2, y + band, w - 4, h - band - 2)
+        for paper, (tx, ty, tw, th) in zip(papers, tiles):
+            drawing.rect(tx, ty, tw, th, tint(color, 0.35))
+            font = fit_font_size(paper, TITLE_FONT_SIZE, tw * 0.9, th * 0.8)
+            if font:
+                drawing.text(tx + tw / 2, ty + th / 2, paper, font)
+    return drawing
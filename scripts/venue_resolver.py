@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Venue resolver for BibTeX journal/booktitle strings
+
+Maps raw venue strings to a canonical venue name and a tier ('arxiv',
+'top-tier' or 'specialized') using one precompiled, word-boundary aware
+pattern. Every distinct (normalized) venue is resolved once; results are
+stored in a JSON cache together with the text that matched, so the
+classification can be audited and is reused across runs. The cache is
+discarded automatically when VENUE_RULES change.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import slr_data
+
+CACHE_PATH = os.path.join(slr_data.CACHE_DIR, "venues.json")
+
+# (canonical venue, patterns) - all top-tier; patterns are matched against the
+# normalized (lowercased, whitespace-collapsed) venue string
+VENUE_RULES = [
+    ("ACL", [r"\bacl\b", r"annual meeting of the association for computational linguistics",
+             r"findings of the association for computational linguistics"]),
+    ("EMNLP", [r"\bemnlp\b", r"empirical methods in natural language processing"]),
+    ("NAACL", [r"\bnaacl\b", r"north american chapter of the association for computational linguistics"]),
+    ("EACL", [r"\beacl\b", r"european chapter of the association for computational linguistics"]),
+    ("COLING", [r"\bcoling\b", r"international conference on computational linguistics"]),
+    ("NeurIPS", [r"\bneurips\b", r"\bnips\b", r"neural information processing systems"]),
+    ("ICLR", [r"\biclr\b", r"international conference on learning representations"]),
+    ("ICML", [r"\bicml\b", r"international conference on machine learning"]),
+    ("AAAI", [r"\baaai\b"]),
+    ("IJCAI", [r"\bijcai\b", r"international joint conference on artificial intelligence"]),
+    ("SIGIR", [r"\bsigir\b"]),
+    ("IEEE S&P", [r"ieee symposium on security and privacy", r"\bs\s*&\s*p\b", r"\(sp\)"]),
+    ("ACM CCS", [r"\bccs\b", r"computer and communications security", r"\bacm sigsac\b"]),
+    ("USENIX Security", [r"\busenix\b"]),
+    ("ACM MM", [r"\bacm mm\b", r"\bacm multimedia\b", r"acm international conference on multimedia\b"]),
+]
+
+ARXIV_PATTERN = re.compile(r"\barxiv\b")
+PREPRINT_PATTERN = re.compile(r"\bpreprint\b")
+
+_GROUPS = {f"r{i}": canonical for i, (canonical, _) in enumerate(VENUE_RULES)}
+TOP_TIER_MATCHER = re.compile("|".join(
+    f"(?P<r{i}>{'|'.join(patterns)})" for i, (_, patterns) in enumerate(VENUE_RULES)
+))
+RULES_FINGERPRINT = hashlib.sha1(
+    repr((VENUE_RULES, ARXIV_PATTERN.pattern, PREPRINT_PATTERN.pattern)).encode("utf-8")
+).hexdigest()
+
+
+def normalize_venue(venue):
+    """
+    Normalize a venue string so different editions share one cache entry.
+    - Drop braces, lowercase and collapse whitespace
+    - Replace arXiv identifiers, years and edition ordinals
+    """
+    text = re.sub(r"[{}]", "", venue or "").lower()
+    text = re.sub(r"arxiv:\s*\d{4}\.\d{4,5}(v\d+)?", "arxiv", text)
+    text = re.sub(r"\b(19|20)\d{2}\b", "", text)
+    text = re.sub(r"\b\d+(st|nd|rd|th)\b", "", text)
+    text = re.sub(r"\s+", " ", text).strip(" -,")
+    return text
+
+
+class VenueResolver:
+    """Resolves venues to (canonical name, tier), backed by a persistent cache."""
+
+    def __init__(self, cache_path=CACHE_PATH):
+        self.cache_path = cache_path
+        self.venues = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if cache.get("rules") == RULES_FINGERPRINT:
+            self.venues = cache.get("venues", {})
+
+    def save(self):
+        """Write the cache if new venues were resolved."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump({"rules": RULES_FINGERPRINT, "venues": self.venues},
+                      f, indent=2, sort_keys=True, ensure_ascii=False)
+        self.dirty = False
+
+    def resolve(self, venue, entry_type=""):
+        """
+        Return a dict with the raw venue, canonical venue, tier and the
+        matched text (None for specialized venues).
+
+        `entry_type` is part of the key because an '@article' whose venue
+        mentions 'preprint' counts as arXiv.
+        """
+        normalized = normalize_venue(venue)
+        key = f"{entry_type.lower()}|{normalized}"
+        if key not in self.venues:
+            self.venues[key] = self._classify(venue, normalized, entry_type.lower())
+            self.dirty = True
+        return self.venues[key]
+
+    @staticmethod
+    def _classify(raw, normalized, entry_type):
+        record = {"raw": re.sub(r"\s+", " ", raw or "").strip()}
+
+        arxiv = ARXIV_PATTERN.search(normalized)
+        if not arxiv and entry_type == "article":
+            arxiv = PREPRINT_PATTERN.search(normalized)
+        if arxiv:
+            record.update(canonical="arXiv", tier="arxiv", match=arxiv.group(0))
+            return record
+
+        match = TOP_TIER_MATCHER.search(normalized)
+        if match:
+            record.update(canonical=_GROUPS[match.lastgroup], tier="top-tier",
+                          match=match.group(0))
+            return record
+
+        record.update(canonical=record["raw"], tier="specialized", match=None)
+        return record
@@ -7,9 +7,16 @@ Reads SLR-Deep sheet from SLR.xlsx and verifies all statistical claims
 import pandas as pd
 import re
 from collections import defaultdict
-from difflib import SequenceMatcher
 import sys
 
+import citation_matches
+import slr_data
+from venue_resolver import VenueResolver
+
+# Columns of the SLR-Deep sheet used by the verification
+SLR_COLUMNS = ['#', 'title', 'Year', 'LLM']
+BIB_PATH = './references/SLR.bib'
+
 # Configure output encoding for Windows
 if sys.platform == 'win32':
     import io
@@ -19,7 +26,7 @@ if sys.platform == 'win32':
 def read_slr_data(excel_path):
     """Load Excel sheet and return DataFrame"""
     try:
-        df = pd.read_excel(excel_path, sheet_name='SLR-Deep')
+        df = slr_data.load_sheet(excel_path, SLR_COLUMNS)
         print(f"✓ Loaded {len(df)} papers from {excel_path}")
         return df
     except Exception as e:
@@ -77,12 +84,16 @@ def parse_bib_file(bib_path):
                 venue_parts.append(publisher_match.group(1))
             venue = " ".join(venue_parts)
             
+            # Journal or booktitle alone names the venue; publisher is a fallback
+            venue_title = venue_parts[0] if journal_match or booktitle_match else venue
+            
             bib_data[citation_key] = {
                 'title': title,
                 'year': year,
                 'authors': authors,
                 'first_author': first_author,
                 'venue': venue,
+                'venue_title': venue_title,
                 'type': entry_type
             }
         
@@ -93,16 +104,14 @@ def parse_bib_file(bib_path):
         return {}
 
 
-def similarity(a, b):
-    """Calculate similarity ratio between two strings"""
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
-
-
-def match_papers_to_bib(df, bib_data):
+def match_papers_to_bib(df, bib_data, bib_path=BIB_PATH):
     """Match papers from Excel to BibTeX entries"""
     matches = {}
     unmatched = []
     
+    # Shared, cached title matching (see citation_matches.py)
+    citations = citation_matches.CitationMatcher(bib_path)
+    
     for idx, row in df.iterrows():
         title = str(row.get('title', '')).strip()
         year = str(row.get('Year', '')).strip()
@@ -110,43 +119,27 @@ def match_papers_to_bib(df, bib_data):
         if not title or title == 'nan':
             continue
         
-        best_match = None
-        best_score = 0.0
-        
-        # Try to find matching BibTeX entry
-        for key, bib_info in bib_data.items():
-            bib_title = bib_info['title']
-            bib_year = bib_info['year']
-            
-            # Calculate title similarity
-            title_sim = similarity(title, bib_title)
-            
-            # Bonus for year match
-            year_bonus = 0.1 if year == bib_year else 0
-            
-            total_score = title_sim + year_bonus
-            
-            if total_score > best_score:
-                best_score = total_score
-                best_match = key
+        match = citations.match(title, year, row.get('#'))
         
-        # Use threshold of 0.7 for matching
-        if best_match and best_score >= 0.7:
+        if match['key'] in bib_data:
             matches[idx] = {
-                'citation_key': best_match,
+                'citation_key': match['key'],
                 'title': title,
                 'year': year,
-                'match_score': best_score,
-                'bib_info': bib_data[best_match]
+                'match_score': match['score'],
+                'match_method': match['method'],
+                'bib_info': bib_data[match['key']]
             }
         else:
             unmatched.append({
                 'title': title,
                 'year': year,
-                'best_match': best_match if best_match else None,
-                'best_score': best_score
+                'best_match': match.get('best_key'),
+                'best_score': match['score']
             })
     
+    citations.save()
+    
     print(f"✓ Matched {len(matches)}/{len(df)} papers to BibTeX entries")
     if unmatched:
         print(f"  ⚠ {len(unmatched)} papers could not be matched")
@@ -208,14 +201,26 @@ def classify_model_type(llm_text):
     return 'unknown'
 
 
+# Year periods reported in RQ1, in table order
+YEAR_PERIODS = ['2020', '2021-2022', '2023', '2024-2025']
+
+
+def year_period(year):
+    """RQ1 year period of a publication year, or None outside the reviewed range"""
+    if year == 2020:
+        return '2020'
+    if 2021 <= year <= 2022:
+        return '2021-2022'
+    if year == 2023:
+        return '2023'
+    if 2024 <= year <= 2025:
+        return '2024-2025'
+    return None
+
+
 def verify_publication_trends(df, matches):
     """Count papers by year period"""
-    trends = {
-        '2020': [],
-        '2021-2022': [],
-        '2023': [],
-        '2024-2025': []
-    }
+    trends = {period: [] for period in YEAR_PERIODS}
     
     for idx, row in df.iterrows():
         year_str = str(row.get('Year', '')).strip()
@@ -233,14 +238,9 @@ def verify_publication_trends(df, matches):
                 'citation': citation_key
             }
             
-            if year == 2020:
-                trends['2020'].append(paper_info)
-            elif 2021 <= year <= 2022:
-                trends['2021-2022'].append(paper_info)
-            elif year == 2023:
-                trends['2023'].append(paper_info)
-            elif 2024 <= year <= 2025:
-                trends['2024-2025'].append(paper_info)
+            period = year_period(year)
+            if period:
+                trends[period].append(paper_info)
         except (ValueError, TypeError):
             continue
     
@@ -287,37 +287,26 @@ def verify_publication_venues(df, matches, bib_data):
         'specialized': []
     }
     
-    top_tier_keywords = [
-        'acl', 'neurips', 'iclr', 'icml', 'aaai', 'ijcai',
-        'sigir', 'emnlp', 'naacl', 'eacl', 'coling',
-        'ieee symposium on security', 'sp ', 'ccs', 'usenix',
-        'acm sigsac', 'computer and communications security',
-        'international conference on multimedia', 'mm ', 'acm mm'
-    ]
+    # Each distinct venue string is classified once and cached across runs
+    resolver = VenueResolver()
     
     for idx, row in df.iterrows():
         title = str(row.get('title', '')).strip()
         citation_key = matches.get(idx, {}).get('citation_key', 'N/A')
         bib_info = matches.get(idx, {}).get('bib_info', {})
-        venue = bib_info.get('venue', '').lower()
         entry_type = bib_info.get('type', '').lower()
+        resolved = resolver.resolve(bib_info.get('venue_title', ''), entry_type)
         
         paper_info = {
             'title': title,
-            'venue': venue,
+            'venue': resolved['canonical'],
             'citation': citation_key,
             'type': entry_type
         }
         
-        # Check if it's an arXiv preprint
-        if 'arxiv' in venue or entry_type == 'article' and 'preprint' in venue:
-            venues['arxiv'].append(paper_info)
-        # Check for top-tier venues
-        elif any(keyword in venue for keyword in top_tier_keywords):
-            venues['top-tier'].append(paper_info)
-        # Everything else is specialized
-        else:
-            venues['specialized'].append(paper_info)
+        venues[resolved['tier']].append(paper_info)
+    
+    resolver.save()
     
     total = sum(len(v) for v in venues.values())
     if total == 0:
@@ -483,7 +472,7 @@ def generate_report(df, matches, bib_data, output_path):
 
 if __name__ == "__main__":
     excel_path = "./SLR.xlsx"
-    bib_path = "./references/SLR.bib"
+    bib_path = BIB_PATH
     output_path = "./rq1_verification_report.md"
     
     print("=" * 60)
@@ -501,7 +490,7 @@ if __name__ == "__main__":
         sys.exit(1)
     
     # Match papers to BibTeX
-    matches, unmatched = match_papers_to_bib(df, bib_data)
+    matches, unmatched = match_papers_to_bib(df, bib_data, bib_path)
     
     # Generate report
     generate_report(df, matches, bib_data, output_path)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the SLR generators
+
+Keeps the SLR-Deep sheet and the bibliographies parsed in memory and polls
+the inputs for changes. Bursts of changes (e.g. an editor or Excel saving
+several times) are debounced, the changed inputs are re-parsed, and only
+the generators that depend on them are rerun:
+
+- SLR.xlsx                      -> tables, sunburst, statistics, dashboard, verification report
+- references/bibliography.bib   -> tables
+- references/SLR.bib            -> statistics, verification report
+- sections/*.tex                -> verification report
+
+SLR.xlsx edits are compared with the previous revision row by row (see
+slr_changes.py), and only the generators reading a changed column rerun.
+When SLR.xlsx cannot be read, its generators are skipped until the next
+save instead of rerunning on the previous frame.
+
+The sunburst is drawn from SLR.xlsx here, like every other generator, while
+running generate_sunburst.py on its own reads the CSV export; the two charts
+differ whenever the export lags behind the workbook.
+
+Run from the repository root:
+    python scripts/watch.py
+"""
+
+import glob
+import os
+import sys
+import time
+
+import generate_sunburst
+import citation_matches
+import generate_dashboard
+import generate_statistics
+import generate_tables
+import lint_latex
+import slr_changes
+import slr_data
+import validate_slr_data
+import verify_rq1_claims
+
+
+EXCEL_PATH = generate_tables.EXCEL_PATH
+TABLES_BIB_PATH = generate_tables.BIB_PATH
+VERIFY_BIB_PATH = verify_rq1_claims.BIB_PATH
+SECTIONS_GLOB = "./sections/*.tex"
+REPORT_PATH = "./rq1_verification_report.md"
+
+POLL_INTERVAL = 0.2  # seconds between mtime scans
+DEBOUNCE_SECONDS = 0.5  # inputs must be quiet this long before a rebuild
+
+
+class WarmInputs:
+    """Parsed inputs kept in memory between rebuilds."""
+
+    def __init__(self):
+        self.df = None
+        self.table_rows = None
+        self.table_citations = None
+        self.table_fragments = generate_tables.RowFragments()
+        self.verify_bib = {}
+        self.sheet_changes = None
+        self.sheet_failed = False
+
+    def reload(self, changed):
+        """Re-parse the inputs in `changed`; keep the previous data on failure."""
+        if EXCEL_PATH in changed:
+            self.sheet_changes = None
+            self.sheet_failed = True
+            try:
+                # All columns: the generators share one frame and index it by position
+                df = slr_data.load_sheet(EXCEL_PATH, None)
+            except Exception as e:
+                # Excel may still be writing the file; the next save retriggers
+                print(f"✗ Could not read {EXCEL_PATH}: {e}")
+            else:
+                validate_slr_data.print_summary(validate_slr_data.validate_file(df, EXCEL_PATH))
+                self.df = df
+                self.sheet_failed = False
+                self.table_rows = generate_tables.rows_from_dataframe(df)
+                self.sheet_changes = slr_changes.detect_changes(df, EXCEL_PATH)
+                slr_changes.print_summary(self.sheet_changes)
+        if TABLES_BIB_PATH in changed:
+            self.table_citations = citation_matches.CitationMatcher(TABLES_BIB_PATH)
+        if VERIFY_BIB_PATH in changed:
+            self.verify_bib = verify_rq1_claims.parse_bib_file(VERIFY_BIB_PATH)
+
+
+def watched_paths():
+    """List every input file, excluding the sections we write ourselves."""
+    generated = {os.path.normpath(generate_tables.OUTPUT_PATH),
+                 os.path.normpath(generate_statistics.OUTPUT_PATH)}
+    sections = [path for path in glob.glob(SECTIONS_GLOB)
+                if os.path.normpath(path) not in generated]
+    return [EXCEL_PATH, TABLES_BIB_PATH, VERIFY_BIB_PATH, lint_latex.ROOT_PATH] + sorted(sections)
+
+
+def scan():
+    """Return a {path: mtime_ns} snapshot of the watched inputs."""
+    snapshot = {}
+    for path in watched_paths():
+        try:
+            snapshot[path] = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            continue
+    return snapshot
+
+
+def diff_snapshots(before, after):
+    """Paths that were added, removed or modified between two snapshots."""
+    return {path for path in before.keys() | after.keys()
+            if before.get(path) != after.get(path)}
+
+
+def wait_for_changes(snapshot):
+    """
+    Block until inputs change and then stay quiet for DEBOUNCE_SECONDS.
+
+    Returns the new snapshot and the set of changed paths.
+    """
+    while True:
+        time.sleep(POLL_INTERVAL)
+        current = scan()
+        if current != snapshot:
+            break
+
+    # Debounce: keep scanning until nothing has changed for a full window
+    quiet_since = time.monotonic()
+    while time.monotonic() - quiet_since < DEBOUNCE_SECONDS:
+        time.sleep(POLL_INTERVAL)
+        latest = scan()
+        if latest != current:
+            current = latest
+            quiet_since = time.monotonic()
+
+    return current, diff_snapshots(snapshot, current)
+
+
+def sheet_generators(sheet_changes, sheet_columns):
+    """Generators affected by a sheet change feed (all of them without one)."""
+    # Sheet columns each generator reads; None reads them all
+    reads = {
+        "tables": {sheet_columns[pos] for pos in generate_tables.projected_columns()[0]
+                   if pos < len(sheet_columns)},
+        "sunburst": set(generate_sunburst.csv_columns),
+        "statistics": set(verify_rq1_claims.SLR_COLUMNS),
+        "dashboard": None,
+        "verification": set(verify_rq1_claims.SLR_COLUMNS),
+    }
+    columns = slr_changes.changed_columns(sheet_changes) if sheet_changes else None
+    if columns is None:
+        return set(reads)
+    return {name for name, read in reads.items() if columns and (read is None or read & columns)}
+
+
+def affected_generators(changed, sheet_changes=None, sheet_columns=()):
+    """Map changed input paths to the generators that must rerun."""
+    # Every input either is LaTeX or regenerates it
+    generators = {"lint"}
+    for path in changed:
+        if path == EXCEL_PATH:
+            generators.update(sheet_generators(sheet_changes, list(sheet_columns)))
+        elif path == TABLES_BIB_PATH:
+            generators.add("tables")
+        elif path == lint_latex.ROOT_PATH:
+            continue
+        elif path == VERIFY_BIB_PATH:
+            generators.update(("statistics", "verification"))
+        else:
+            # The section sources feed the RQ1 report
+            generators.add("verification")
+    return generators
+
+
+def run_tables(inputs):
+    generate_tables.write_tables(
+        generate_tables.render_tables(inputs.table_rows, inputs.table_citations,
+                                      fragments=inputs.table_fragments))
+    print("Successfully wrote generated_tables.tex")
+
+
+def run_sunburst(inputs):
+    generate_sunburst.render_sunburst(inputs.df)
+
+
+def run_statistics(inputs):
+    matches, _ = verify_rq1_claims.match_papers_to_bib(inputs.df, inputs.verify_bib, VERIFY_BIB_PATH)
+    if generate_statistics.write_statistics(generate_statistics.compute_statistics(inputs.df, matches)):
+        print(f"Updated {generate_statistics.OUTPUT_PATH}")
+
+
+def run_dashboard(inputs):
+    generate_dashboard.write_dashboard(inputs.df)
+
+
+def run_verification(inputs):
+    matches, _ = verify_rq1_claims.match_papers_to_bib(inputs.df, inputs.verify_bib, VERIFY_BIB_PATH)
+    verify_rq1_claims.generate_report(inputs.df, matches, inputs.verify_bib, REPORT_PATH)
+
+
+def run_lint(inputs):
+    errors, file_count = lint_latex.lint()
+    for path, line, message in errors:
+        print(f"{path}:{line}: {message}")
+    print(f"{len(errors)} LaTeX problems in {file_count} files")
+
+
+GENERATORS = {
+    "tables": run_tables,
+    "sunburst": run_sunburst,
+    "statistics": run_statistics,
+    "dashboard": run_dashboard,
+    "verification": run_verification,
+    "lint": run_lint,
+}
+
+
+def run_generators(names, inputs):
+    """Run the named generators in a fixed order, reporting errors and timings."""
+    if inputs.df is None:
+        print("✗ No SLR data loaded yet; waiting for the next change")
+        return
+    for name in GENERATORS:
+        if name not in names:
+            continue
+        start = time.perf_counter()
+        try:
+            GENERATORS[name](inputs)
+        except Exception as e:
+            print(f"✗ {name} failed: {e}")
+        else:
+            print(f"✓ {name} ({time.perf_counter() - start:.2f}s)")
+
+
+def main():
+    """Build everything once, then rebuild affected outputs on every change."""
+    inputs = WarmInputs()
+    snapshot = scan()
+    inputs.reload(set(snapshot))
+    run_generators(set(GENERATORS), inputs)
+
+    print(f"\nWatching {len(snapshot)} files (Ctrl+C to stop)...")
+    try:
+        while True:
+            snapshot, changed = wait_for_changes(snapshot)
+            print("\n" + "=" * 60)
+            print("Changed: " + ", ".join(sorted(changed)))
+            start = time.perf_counter()
+            inputs.reload(changed)
+            if inputs.sheet_failed and EXCEL_PATH in changed:
+                # Rerunning the sheet generators would only repeat the stale frame
+                changed = changed - {EXCEL_PATH}
+                print(f"⚠ Skipping generators that read {EXCEL_PATH} until it can be read")
+            if changed:
+                sheet_columns = inputs.df.columns if inputs.df is not None else ()
+                run_generators(affected_generators(changed, inputs.sheet_changes, sheet_columns), inputs)
+            print(f"Rebuilt in {time.perf_counter() - start:.2f}s")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()